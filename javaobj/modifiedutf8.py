@@ -17,6 +17,7 @@ https://github.com/swstephe/py2jdbc/
 
 from __future__ import unicode_literals
 
+import re
 import sys
 
 
@@ -30,11 +31,25 @@ __docformat__ = "restructuredtext en"
 # Encoding name: not cesu-8, which uses a different zero-byte
 NAME = "mutf8"
 
+# Bytes which are not decoded the same way in UTF-8 and in Modified UTF-8:
+# raw zero, encoded zero (0xC0 0x80), surrogates (0xED 0xA0 to 0xED 0xBF)
+# and 4-byte sequences
+SPECIAL_BYTES = re.compile(b"[\\x00\\xc0\\xf0-\\xff]|\\xed[\\xa0-\\xbf]")
+
+# Run of characters encoded on a single byte
+ASCII_RUN = re.compile(b"[\\x01-\\x7f]+")
+
+# Scan of the high bit of all bytes (Python 3.7+)
+bytes_isascii = getattr(bytes, "isascii", None)
+
 # ------------------------------------------------------------------------------
 
 if sys.version_info[0] >= 3:
     unicode_char = chr  # pylint:disable=C0103
 
+    # Sequences of bytes which are indexed as integers
+    INT_BYTES_TYPES = (bytes, bytearray)
+
     def byte_to_int(data):
         # type: (bytes) -> int
         """
@@ -58,6 +73,9 @@ else:
         unichr  # pylint:disable=C0103,undefined-variable  # noqa: F821
     )
 
+    # Sequences of bytes which are indexed as integers
+    INT_BYTES_TYPES = (bytearray,)
+
     def byte_to_int(data):
         # type: (bytes) -> int
         """
@@ -78,66 +96,8 @@ else:
 
 # ------------------------------------------------------------------------------
 
-
-class DecodeMap(object):  # pylint:disable=R0205
-    """
-    A utility class which manages masking, comparing and mapping in bits.
-    If the mask and compare fails, this will raise UnicodeDecodeError so
-    encode and decode will correctly handle bad characters.
-    """
-
-    def __init__(self, count, mask, value, bits):
-        """
-        Initialize a DecodeMap, entry from a static dictionary for the module.
-        It automatically calculates the mask for the bits for the value
-        (always assumed to be at the bottom of the byte).
-
-        :param count: The number of bytes in this entire sequence.
-        :param mask: The mask to apply to the byte at this position.
-        :param value: The value of masked bits, (without shifting).
-        :param bits: The number of bits.
-        """
-        self.count = count
-        self.mask = mask
-        self.value = value
-        self.bits = bits
-        self.mask2 = (1 << bits) - 1
-
-    def apply(self, byte, value, data, i, count):
-        """
-        Apply mask, compare to expected value, shift and return result.
-        Eventually, this could become a ``reduce`` function.
-
-        :param byte: The byte to compare
-        :param value: The currently accumulated value.
-        :param data: The data buffer, (array of bytes).
-        :param i: The position within the data buffer.
-        :param count: The position of this comparison.
-        :return: A new value with the bits merged in.
-        :raises UnicodeDecodeError: if marked bits don't match.
-        """
-        if byte & self.mask == self.value:
-            value <<= self.bits
-            value |= byte & self.mask2
-        else:
-            raise UnicodeDecodeError(
-                NAME,
-                data,
-                i,
-                i + count,
-                "invalid {}-byte sequence".format(self.count),
-            )
-        return value
-
-    def __repr__(self):
-        return "DecodeMap({})".format(
-            ", ".join(
-                "{}=0x{:02x}".format(n, getattr(self, n))
-                for n in ("count", "mask", "value", "bits", "mask2")
-            )
-        )
-
-
+# Masks and expected values of the bytes following the first one of each
+# kind of multi-byte sequence: (mask, value, number of payload bits)
 DECODER_MAP = {
     2: ((0xC0, 0x80, 6),),
     3: ((0xC0, 0x80, 6), (0xC0, 0x80, 6)),
@@ -150,9 +110,35 @@ DECODER_MAP = {
     ),
 }
 
-DECODE_MAP = dict(
-    (k, tuple(DecodeMap(k, *vv) for vv in v)) for k, v in DECODER_MAP.items()
-)
+
+def _describe_lead_byte(d):
+    """
+    Describes the sequence started by the given byte
+
+    :param d: Value of the first byte of a sequence
+    :return: A (sequence length, initial value, error message) tuple
+    """
+    if d == 0x00:  # 00000000
+        return 0, 0, "embedded zero-byte not allowed"
+    if not d & 0x80:  # 0xxxxxxx
+        return 1, d, None
+    if not d & 0x40:  # 10xxxxxx
+        return 0, 0, "misplaced continuation character"
+    if not d & 0x20:  # 110xxxxx
+        return 2, d & 0x1F, None
+    if d & 0x10:  # 1111xxxx
+        return 0, 0, "invalid encoding character"
+    if d == 0xED:  # Surrogate pair if followed by 1010xxxx, else 3 bytes
+        return 6, 0, None
+    # 1110xxxx
+    return 3, d & 0x0F, None
+
+
+# Description of the sequence started by each byte value
+LEAD_BYTES = tuple(_describe_lead_byte(d) for d in range(256))
+
+# Characters which can be encoded on up to 2 bytes, by code point
+TWO_BYTES_CHARS = tuple(unicode_char(value) for value in range(0x800))
 
 
 def decoder(data):
@@ -162,59 +148,144 @@ def decoder(data):
 
     It takes bits from the byte until it matches one of the known encoding
     sequences.
-    It uses ``DecodeMap`` to mask, compare and generate values.
 
     :param data: a string of bytes in Modified UTF-8 encoding.
     :return: a generator producing a string of unicode characters
     :raises UnicodeDecodeError: unrecognised byte in sequence encountered.
     """
 
-    def next_byte(_it, start, count):
-        try:
-            return next(_it)[1]
-        except StopIteration:
-            raise UnicodeDecodeError(
-                NAME, data, start, start + count, "incomplete byte sequence"
+    # Walk the bytes as integers, by index
+    if not isinstance(data, INT_BYTES_TYPES):
+        data = bytearray(data)
+    size = len(data)
+
+    i = 0
+    while i < size:
+        d = data[i]
+        count, value, error = LEAD_BYTES[d]
+        if count == 6 and i + 1 < size and (data[i + 1] & 0xF0) != 0xA0:
+            # Not a high surrogate: plain 3-byte sequence
+            count = 3
+            value = d & 0x0F
+
+        if count == 1:
+            # Decode the whole ASCII run at once
+            end = ASCII_RUN.match(data, i).end()
+            for char in data[i:end].decode("ascii"):
+                yield char
+            i = end
+            continue
+
+        if count == 2 and i + 1 < size:
+            d1 = data[i + 1]
+            if (d1 & 0xC0) == 0x80:
+                yield TWO_BYTES_CHARS[(value << 6) | (d1 & 0x3F)]
+                i += 2
+                continue
+        elif count == 3 and i + 2 < size:
+            d1, d2 = data[i + 1 : i + 3]
+            if (((d1 << 8) | d2) & 0xC0C0) == 0x8080:
+                yield mutf8_unichr(
+                    (value << 12) | ((d1 & 0x3F) << 6) | (d2 & 0x3F)
+                )
+                i += 3
+                continue
+        elif count == 6 and i + 5 < size:
+            # Surrogate pair: 1110 1101, 1010 xxxx, 10xx xxxx,
+            # 1110 1101, 1011 yyyy, 10yy yyyy
+            b1, b2, b3, b4, b5 = data[i + 1 : i + 6]
+            packed = (b1 << 32) | (b2 << 24) | (b3 << 16) | (b4 << 8) | b5
+            if (packed & 0xF0C0FFF0C0) == 0xA080EDB080:
+                yield mutf8_unichr(
+                    0x10000
+                    + (
+                        ((b1 & 0x0F) << 16)
+                        | ((b2 & 0x3F) << 10)
+                        | ((b4 & 0x0F) << 6)
+                        | (b5 & 0x3F)
+                    )
+                )
+                i += 6
+                continue
+
+        raise _sequence_error(data, i, count, error)
+
+
+def _sequence_error(data, start, count, error):
+    """
+    Describes the error in the invalid sequence at the given position
+
+    :param data: Decoded bytes
+    :param start: Position of the first byte of the sequence
+    :param count: Expected length of the sequence
+    :param error: Error message associated to the first byte, if any
+    :return: The UnicodeDecodeError to raise
+    """
+    if error is not None:
+        return UnicodeDecodeError(NAME, data, start, start + 1, error)
+
+    for i1, (mask, expected, _) in enumerate(DECODER_MAP[count], 1):
+        if start + i1 >= len(data):
+            return UnicodeDecodeError(
+                NAME, data, start, start + i1, "incomplete byte sequence"
+            )
+
+        if (data[start + i1] & mask) != expected:
+            return UnicodeDecodeError(
+                NAME,
+                data,
+                start,
+                start + i1,
+                "invalid {0}-byte sequence".format(count),
             )
 
-    it = iter(enumerate(data))
-    for i, d in it:
-        if d == 0x00:  # 00000000
+    return UnicodeDecodeError(
+        NAME,
+        data,
+        start,
+        start + count,
+        "invalid {0}-byte sequence".format(count),
+    )
+
+
+def decode_segments(data):
+    """
+    Decodes the plain UTF-8 runs of the given data with the built-in codec
+    and only the special sequences with the Modified UTF-8 decoder.
+
+    :param data: a string of bytes in Modified UTF-8
+    :return: unicode text
+    :raises UnicodeDecodeError: invalid or unexpected sequence
+    """
+    parts = []
+    start = 0
+    for match in SPECIAL_BYTES.finditer(data):
+        idx = match.start()
+        if idx < start:
+            # Part of a sequence already decoded
+            continue
+
+        lead = match.group()
+        if lead == b"\xc0":
+            end = idx + 2
+        elif lead[:1] == b"\xed":
+            if lead < b"\xed\xb0":
+                # High surrogate: start of a surrogate pair
+                end = idx + 6
+            else:
+                # Low surrogate on its own
+                end = idx + 3
+        else:
             raise UnicodeDecodeError(
-                NAME, data, i, i + 1, "embedded zero-byte not allowed"
+                NAME, data, idx, idx + 1, "invalid encoding character"
             )
 
-        if d & 0x80:  # 1xxxxxxx
-            if d & 0x40:  # 11xxxxxx
-                if d & 0x20:  # 111xxxxx
-                    if d & 0x10:  # 1111xxxx
-                        raise UnicodeDecodeError(
-                            NAME, data, i, i + 1, "invalid encoding character"
-                        )
-
-                    if d == 0xED:
-                        value = 0
-                        for i1, dm in enumerate(DECODE_MAP[6]):
-                            d1 = next_byte(it, i, i1 + 1)
-                            value = dm.apply(d1, value, data, i, i1 + 1)
-                    else:  # 1110xxxx
-                        value = d & 0x0F
-                        for i1, dm in enumerate(DECODE_MAP[3]):
-                            d1 = next_byte(it, i, i1 + 1)
-                            value = dm.apply(d1, value, data, i, i1 + 1)
-                else:  # 110xxxxx
-                    value = d & 0x1F
-                    for i1, dm in enumerate(DECODE_MAP[2]):
-                        d1 = next_byte(it, i, i1 + 1)
-                        value = dm.apply(d1, value, data, i, i1 + 1)
-            else:  # 10xxxxxx
-                raise UnicodeDecodeError(
-                    NAME, data, i, i + 1, "misplaced continuation character"
-                )
-        else:  # 0xxxxxxx
-            value = d
-        # noinspection PyCompatibility
-        yield mutf8_unichr(value)
+        parts.append(data[start:idx].decode("utf-8"))
+        parts.extend(decoder(bytearray(data[idx:end])))
+        start = end
+
+    parts.append(data[start:].decode("utf-8"))
+    return "".join(parts)
 
 
 def decode_modified_utf8(data, errors="strict"):
@@ -228,24 +299,42 @@ def decode_modified_utf8(data, errors="strict"):
     :return: unicode text and length
     :raises UnicodeDecodeError: sequence is invalid.
     """
-    value, length = "", 0
-    it = iter(decoder(byte_to_int(d) for d in data))
-    while True:
-        try:
-            value += next(it)
-            length += 1
-        except StopIteration:
-            break
-        except UnicodeDecodeError as e:
-            if errors == "strict":
-                raise e
-
-            if errors == "ignore":
-                pass
-            elif errors == "replace":
-                value += "\uFFFD"
-                length += 1
-    return value, length
+    if isinstance(data, type("")):
+        # Text holding the byte values
+        data = data.encode("latin-1")
+
+    data = bytes(data)
+    if (
+        bytes_isascii is not None
+        and bytes_isascii(data)
+        and b"\x00" not in data
+    ):
+        # Plain ASCII
+        return data.decode("ascii"), len(data)
+
+    try:
+        if SPECIAL_BYTES.search(data) is None:
+            # Same as standard UTF-8
+            value = data.decode("utf-8")
+        else:
+            value = decode_segments(data)
+        return value, len(value)
+    except UnicodeDecodeError:
+        # Let the complete decoder handle errors
+        pass
+
+    chars = []
+    append = chars.append
+    try:
+        for char in decoder(data):
+            append(char)
+    except UnicodeDecodeError as e:
+        if errors == "strict":
+            raise e
+
+        if errors == "replace":
+            append("\uFFFD")
+    return "".join(chars), len(chars)
 
 
 def mutf8_unichr(value):
@@ -30,15 +30,20 @@ Namely: logging methods, bytes/str/unicode converters
 from __future__ import absolute_import
 
 # Standard library
-from typing import IO, Tuple  # noqa: F401
+from typing import IO, Dict, Tuple  # noqa: F401
+import binascii
 import gzip
 import logging
 import os
 import struct
 import sys
+import zlib
 
 # Modified UTF-8 parser
-from .modifiedutf8 import byte_to_int, decode_modified_utf8
+from .modifiedutf8 import (  # noqa: F401
+    decode_modified_utf8,
+    unicode_char,
+)
 
 # ------------------------------------------------------------------------------
 
@@ -77,6 +82,15 @@ def log_error(message, ident=0):
 
 # ------------------------------------------------------------------------------
 
+# Compiled structs, by format string
+_STRUCT_CACHE = {}  # type: Dict[str, struct.Struct]
+
+# Structs of the string lengths, by format character
+_LENGTH_STRUCTS = {
+    "H": struct.Struct(">H"),
+    "Q": struct.Struct(">Q"),
+}  # type: Dict[str, struct.Struct]
+
 
 def read_struct(data, fmt_str):
     # type: (bytes, str) -> Tuple
@@ -88,8 +102,13 @@ def read_struct(data, fmt_str):
     :param fmt_str: Struct unpack format string
     :return: A tuple (results as tuple, remaining data)
     """
-    size = struct.calcsize(fmt_str)
-    return struct.unpack(fmt_str, data[:size]), data[size:]
+    try:
+        compiled = _STRUCT_CACHE[fmt_str]
+    except KeyError:
+        compiled = _STRUCT_CACHE[fmt_str] = struct.Struct(fmt_str)
+
+    size = compiled.size
+    return compiled.unpack_from(data), data[size:]
 
 
 def read_string(data, length_fmt="H"):
@@ -101,9 +120,37 @@ def read_string(data, length_fmt="H"):
     :param length_fmt: Structure format of the string length (H or Q)
     :return: The deserialized string
     """
-    (length,), data = read_struct(data, ">{0}".format(length_fmt))
-    ba, data = data[:length], data[length:]
-    return to_unicode(ba), data
+    value, end = read_string_from(data, 0, length_fmt)
+    return value, data[end:]
+
+
+def read_string_from(data, offset, length_fmt="H"):
+    # type: (bytes, int, str) -> Tuple[UNICODE_TYPE, int]
+    """
+    Reads a serialized string at the given offset of the data, without
+    copying the rest of it
+
+    :param data: Bytes where to read the string from
+    :param offset: Offset of the string length in the data
+    :param length_fmt: Structure format of the string length (H or Q)
+    :return: The deserialized string and the offset following it
+    """
+    try:
+        compiled = _LENGTH_STRUCTS[length_fmt]
+    except KeyError:
+        compiled = _LENGTH_STRUCTS[length_fmt] = struct.Struct(
+            ">" + length_fmt
+        )
+
+    (length,) = compiled.unpack_from(data, offset)
+    start = offset + compiled.size
+    end = start + length
+    raw = data[start:end]
+    try:
+        # Usual case: the string is also valid UTF-8
+        return raw.decode("utf-8"), end
+    except UnicodeDecodeError:
+        return decode_modified_utf8(raw)[0], end
 
 
 # ------------------------------------------------------------------------------
@@ -121,14 +168,13 @@ def java_data_fd(original_df):
     """
     # Read the first bytes
     start_idx = original_df.tell()
-    magic_header = [byte_to_int(x) for x in original_df.read(2)]  # type: ignore
+    magic_header = original_df.read(2)
     original_df.seek(start_idx, os.SEEK_SET)
 
-    if magic_header[0] == 0xAC:
+    if magic_header[:1] == b"\xac":
         # Consider we have a raw seralized stream: use it
-        original_df.seek(start_idx, os.SEEK_SET)
         return original_df
-    elif magic_header[0] == 0x1F and magic_header[1] == 0x8B:
+    elif magic_header == b"\x1f\x8b":
         # Open the GZip file
         return gzip.GzipFile(fileobj=original_df, mode="rb")  # type: ignore
     else:
@@ -136,9 +182,51 @@ def java_data_fd(original_df):
         return original_df
 
 
+def java_data_bytes(data):
+    # type: (bytes) -> bytes
+    """
+    Ensures that the given bytes are a Java serialized content.
+    GZipped data is uncompressed at once, in memory
+
+    :param data: Input data
+    :return: The input data or its uncompressed content
+    :raise zlib.error: Invalid GZip content
+    """
+    if data[:2] == b"\x1f\x8b":
+        # 16: expect a GZip header and trailer
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+    return data
+
+
 # ------------------------------------------------------------------------------
 
 
+# Translation of bytes to their printable character in a hexdump
+_HEXDUMP_FILTER = bytes(
+    bytearray(x if len(repr(chr(x))) == 3 else ord(".") for x in range(256))
+)
+
+if sys.version_info >= (3, 8):
+
+    def _hex_line(data):
+        # type: (bytes) -> str
+        """
+        Returns the space-separated, upper-case hexadecimal form of the data
+        """
+        return binascii.hexlify(data, " ").decode("ascii").upper()
+
+else:
+
+    def _hex_line(data):
+        # type: (bytes) -> str
+        """
+        Returns the space-separated, upper-case hexadecimal form of the data
+        """
+        hexa = binascii.hexlify(data).decode("ascii").upper()
+        return " ".join(hexa[i : i + 2] for i in range(0, len(hexa), 2))
+
+
 def hexdump(src, start_offset=0, length=16):
     # type: (str, int, int) -> str
     """
@@ -149,19 +237,16 @@ def hexdump(src, start_offset=0, length=16):
     :param length: Length of a dump line
     :return: A dump string
     """
-    hex_filter = "".join(
-        (len(repr(chr(x))) == 3) and chr(x) or "." for x in range(256)
-    )
     pattern = "{{0:04X}}   {{1:<{0}}}  {{2}}\n".format(length * 3)
 
-    # Convert raw data to str (Python 3 compatibility)
-    src = to_str(src, "latin-1")
+    # Work on raw bytes (Python 3 compatibility)
+    src = to_bytes(src, "latin-1")
 
     result = []
     for i in range(0, len(src), length):
         s = src[i : i + length]
-        hexa = " ".join("{0:02X}".format(ord(x)) for x in s)
-        printable = s.translate(hex_filter)
+        hexa = _hex_line(s)
+        printable = to_str(s.translate(_HEXDUMP_FILTER), "latin-1")
         result.append(pattern.format(i + start_offset, hexa, printable))
 
     return "".join(result)
@@ -173,7 +258,6 @@ def hexdump(src, start_offset=0, length=16):
 if sys.version_info[0] >= 3:
     BYTES_TYPE = bytes  # pylint:disable=C0103
     UNICODE_TYPE = str  # pylint:disable=C0103
-    unicode_char = chr  # pylint:disable=C0103
 
     def bytes_char(c):
         """
@@ -220,7 +304,10 @@ if sys.version_info[0] >= 3:
         """
         Concats all bytes into a string
         """
-        return "".join(chr(char) for char in data)
+        return bytes(data).decode("latin-1")
+
+    # Interns the given string
+    intern_str = sys.intern  # pylint:disable=C0103
 
 
 else:
@@ -228,9 +315,6 @@ else:
     UNICODE_TYPE = (
         unicode  # pylint:disable=C0103,undefined-variable  # noqa: F821
     )
-    unicode_char = (
-        unichr  # pylint:disable=C0103,undefined-variable  # noqa: F821
-    )
     bytes_char = chr  # pylint:disable=C0103
 
     # Python 2 interpreter : str & unicode
@@ -274,3 +358,9 @@ else:
         Nothing to do in Python 2
         """
         return data
+
+    def intern_str(data):
+        """
+        Python 2 can't intern unicode strings: return them as is
+        """
+        return data
@@ -28,6 +28,7 @@ from . import beans, core, transformers  # noqa: F401
 from .core import (  # noqa: F401
     load,
     loads,
+    dump,
     dumps,
     JavaObjectMarshaller,
     JavaObjectUnmarshaller,
@@ -27,7 +27,7 @@ Definition of the beans of the v1 parser
 
 from __future__ import absolute_import
 
-from typing import List
+from typing import Any, List, Optional, Tuple
 import struct
 
 from ..utils import UNICODE_TYPE
@@ -68,6 +68,18 @@ class JavaClass(object):  # pylint:disable=R0205
         self.fields_names = []  # type: List[str]
         self.fields_types = []  # type: List[JavaString]
         self.superclass = None  # type: JavaClass
+        # Field names and their UTF-8 form, computed when first written
+        self._fields_names_bytes = (
+            None
+        )  # type: Optional[Tuple[Tuple[str, ...], Tuple[bytes, ...]]]
+        # Names and types of the fields of instances, including inherited
+        # ones, computed when first read
+        self._all_fields = None  # type: Optional[Tuple[List[str], List[Any]]]
+        # TypeCode of the items of an array class, computed when first read
+        self._array_type_code = None  # type: Optional[int]
+        # Reader of the fields of instances, computed when first read:
+        # (struct, conversion methods) if they are all primitive, else False
+        self._fields_reader = None  # type: Any
 
     def __str__(self):
         """
@@ -88,13 +100,17 @@ class JavaClass(object):  # pylint:disable=R0205
         :param other: Other JavaClass to test
         :return: True if both classes share the same fields and name
         """
+        if self is other:
+            return True
+
         if not isinstance(other, type(self)):
             return False
 
+        # Compare the integers first, then the name and the fields
         return (
-            self.name == other.name
-            and self.serialVersionUID == other.serialVersionUID
+            self.serialVersionUID == other.serialVersionUID
             and self.flags == other.flags
+            and self.name == other.name
             and self.fields_names == other.fields_names
             and self.fields_types == other.fields_types
             and self.superclass == other.superclass
@@ -169,8 +185,10 @@ class JavaString(UNICODE_TYPE):
     Represents a Java String
     """
 
-    def __hash__(self):
-        return UNICODE_TYPE.__hash__(self)
+    __slots__ = ()
+
+    # Use the (cached) hash of the string type, without a Python-level call
+    __hash__ = UNICODE_TYPE.__hash__
 
     def __eq__(self, other):
         if not isinstance(other, UNICODE_TYPE):
@@ -209,7 +227,7 @@ class JavaByteArray(JavaObject):
 
     def __init__(self, data, classdesc=None):
         JavaObject.__init__(self)
-        self._data = struct.unpack("b" * len(data), data)
+        self._data = struct.unpack("{0}b".format(len(data)), data)
         self.classdesc = classdesc
 
     def __str__(self):
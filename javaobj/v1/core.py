@@ -47,7 +47,7 @@ except ImportError:
 from .marshaller import JavaObjectMarshaller
 from .unmarshaller import JavaObjectUnmarshaller
 from .transformers import DefaultObjectTransformer
-from ..utils import java_data_fd
+from ..utils import java_data_bytes, java_data_fd
 
 # ------------------------------------------------------------------------------
 
@@ -56,6 +56,7 @@ __all__ = (
     "__version__",
     "JavaObjectMarshaller",
     "JavaObjectUnmarshaller",
+    "dump",
     "dumps",
     "load",
     "loads",
@@ -112,8 +113,26 @@ def loads(string, *transformers, **kwargs):
                                   trailing bytes are remaining
     :return: The deserialized object
     """
-    # Reuse the load method (avoid code duplication)
-    return load(BytesIO(string), *transformers, **kwargs)
+    # Uncompress the whole content at once instead of streaming it, then
+    # reuse the load method (avoid code duplication)
+    return load(BytesIO(java_data_bytes(string)), *transformers, **kwargs)
+
+
+def dump(obj, file_object, *transformers):
+    """
+    Serializes Java primitive data and objects unmarshaled by load(s) before
+    into a file-like object, without keeping the whole content in memory.
+
+    :param obj: A Python primitive object, or one loaded using load(s)
+    :param file_object: A writable binary file-like object
+    :param transformers: Custom transformers to use
+    """
+    marshaller = JavaObjectMarshaller()
+    # Add custom transformers
+    for transformer in transformers:
+        marshaller.add_transformer(transformer)
+
+    marshaller.dump(obj, file_object)
 
 
 def dumps(obj, *transformers):
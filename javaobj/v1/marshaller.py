@@ -36,16 +36,10 @@ http://download.oracle.com/javase/6/docs/platform/serialization/spec/protocol.ht
 from __future__ import absolute_import
 
 # Standard library
-import collections
+import array
 import logging
 import struct
-
-try:
-    # Python 2
-    from StringIO import StringIO as BytesIO
-except ImportError:
-    # Python 3+
-    from io import BytesIO
+import sys
 
 # Javaobj modules
 from .beans import (
@@ -63,7 +57,6 @@ from ..constants import (
     TypeCode,
 )
 from ..utils import (
-    log_debug,
     log_error,
     to_bytes,
     BYTES_TYPE,
@@ -82,6 +75,104 @@ __version__ = ".".join(str(x) for x in __version_info__)
 # Documentation strings format
 __docformat__ = "restructuredtext en"
 
+# Logger of the module (same as the one of the utility methods)
+_log = logging.getLogger("javaobj")
+
+# ------------------------------------------------------------------------------
+
+# Pre-compiled structs
+_S_B = struct.Struct(">B")
+_S_b = struct.Struct(">b")
+_S_H = struct.Struct(">H")
+_S_h = struct.Struct(">h")
+_S_i = struct.Struct(">i")
+_S_q = struct.Struct(">q")
+_S_f = struct.Struct(">f")
+_S_d = struct.Struct(">d")
+_S_qBH = struct.Struct(">qBH")
+_S_BB = struct.Struct(">BB")
+_S_BH = struct.Struct(">BH")
+_S_BI = struct.Struct(">BI")
+_S_BL = struct.Struct(">BL")
+
+# Pre-packed stream header and type markers
+_STREAM_HEADER = struct.pack(
+    ">HH", StreamConstants.STREAM_MAGIC, StreamConstants.STREAM_VERSION
+)
+_TC_ARRAY = _S_B.pack(TerminalCode.TC_ARRAY)
+_TC_CLASS = _S_B.pack(TerminalCode.TC_CLASS)
+_TC_CLASSDESC = _S_B.pack(TerminalCode.TC_CLASSDESC)
+_TC_ENDBLOCKDATA = _S_B.pack(TerminalCode.TC_ENDBLOCKDATA)
+_TC_ENUM = _S_B.pack(TerminalCode.TC_ENUM)
+_TC_NULL = _S_B.pack(TerminalCode.TC_NULL)
+_TC_OBJECT = _S_B.pack(TerminalCode.TC_OBJECT)
+_TC_STRING = _S_B.pack(TerminalCode.TC_STRING)
+
+
+def _pack_boolean(value):
+    """
+    Packs a boolean value
+    """
+    return _S_B.pack(1 if value else 0)
+
+
+def _pack_char(value):
+    """
+    Packs a character
+    """
+    return _S_H.pack(ord(value))
+
+
+# Packers of the primitive values
+_PRIMITIVE_PACKERS = {
+    TypeCode.TYPE_BOOLEAN: _pack_boolean,
+    TypeCode.TYPE_BYTE: _S_b.pack,
+    TypeCode.TYPE_CHAR: _pack_char,
+    TypeCode.TYPE_SHORT: _S_h.pack,
+    TypeCode.TYPE_INTEGER: _S_i.pack,
+    TypeCode.TYPE_LONG: _S_q.pack,
+    TypeCode.TYPE_FLOAT: _S_f.pack,
+    TypeCode.TYPE_DOUBLE: _S_d.pack,
+}
+
+# Also look up the packers with the type character of the field types
+_PRIMITIVE_PACKERS.update(
+    [(chr(code), packer) for code, packer in list(_PRIMITIVE_PACKERS.items())]
+)
+
+
+def _prepare_array_typecodes():
+    """
+    Associates the primitive Java types to the ``array`` type code with the
+    same item size, if any.
+    Floats are excluded, as ``array`` converts out-of-range values to
+    infinity instead of raising an error.
+
+    :return: A TypeCode -> array type code dictionary
+    """
+    if not hasattr(array.array, "tobytes"):
+        # Python 2: no bulk conversion
+        return {}
+
+    typecodes = {}
+    for type_code, array_code, size in (
+        (TypeCode.TYPE_BOOLEAN, "B", 1),
+        (TypeCode.TYPE_BYTE, "b", 1),
+        (TypeCode.TYPE_CHAR, "H", 2),
+        (TypeCode.TYPE_SHORT, "h", 2),
+        (TypeCode.TYPE_INTEGER, "i", 4),
+        (TypeCode.TYPE_LONG, "q", 8),
+        (TypeCode.TYPE_DOUBLE, "d", 8),
+    ):
+        if array.array(array_code).itemsize == size:
+            typecodes[type_code] = array_code
+
+    return typecodes
+
+
+# Type codes of arrays which can convert primitive arrays at once
+_ARRAY_TYPECODES = _prepare_array_typecodes()
+
 # ------------------------------------------------------------------------------
 
 
@@ -97,9 +188,24 @@ class JavaObjectMarshaller:
         :param stream: An output stream
         """
         self.object_stream = stream
+        self._write = getattr(stream, "write", None)
         self.object_obj = None
         self.object_transformers = []
-        self.references = []
+        # id(JavaClass) -> (JavaClass, fields plan of its hierarchy)
+        self._fields_cache = {}
+        # Field type -> type code value
+        self._type_chars = {}
+        self._reset_references()
+
+        # Bean type -> writer method (exact type match)
+        self._bean_writers = {
+            JavaArray: self.write_array,
+            JavaByteArray: self.write_array,
+            JavaEnum: self.write_enum,
+            JavaObject: self.write_object,
+            JavaString: self.write_string,
+            JavaClass: self.write_class,
+        }
 
     def add_transformer(self, transformer):
         """
@@ -109,26 +215,98 @@ class JavaObjectMarshaller:
         """
         self.object_transformers.append(transformer)
 
-    def dump(self, obj):
+    def dump(self, obj, stream=None):
         """
         Dumps the given object in the Java serialization format
+
+        :param obj: The object to serialize
+        :param stream: If given, the serialized form is written to this
+                       output stream as it is generated
+        :return: The serialized form as bytes, or None if it has been written
+                 to the given stream
         """
-        self.references = []
+        self._reset_references()
+        self._fields_cache = {}
         self.object_obj = obj
-        self.object_stream = BytesIO()
+        if stream is None:
+            self.object_stream = bytearray()
+            self._write = self.object_stream.extend
+        else:
+            self.object_stream = stream
+            self._write = stream.write
+
         self._writeStreamHeader()
         self.writeObject(obj)
-        return self.object_stream.getvalue()
+
+        if stream is None:
+            return bytes(self.object_stream)
+        return None
+
+    def _reset_references(self):
+        """
+        Clears the references written in the stream
+        """
+        self.references = []
+        # id(object) -> reference index
+        self._references_ids = {}
+        # String value -> reference index
+        self._references_strings = {}
+        # (name, serialVersionUID) -> [(class, reference index)]
+        self._references_classes = {}
+        # (enum, reference index), shared by value
+        self._references_enums = []
+
+    def _add_reference(self, obj):
+        """
+        Stores a new reference to the given object
+
+        :param obj: The referenced object
+        :return: The index of the new reference
+        """
+        idx = len(self.references)
+        self.references.append(obj)
+        if isinstance(obj, (BYTES_TYPE, UNICODE_TYPE)):
+            self._references_strings.setdefault(obj, idx)
+        else:
+            self._references_ids[id(obj)] = idx
+            if isinstance(obj, JavaClass):
+                self._references_classes.setdefault(
+                    (obj.name, obj.serialVersionUID), []
+                ).append((obj, idx))
+            elif isinstance(obj, JavaEnum):
+                self._references_enums.append((obj, idx))
+        return idx
+
+    def _find_reference(self, obj):
+        """
+        Looks for the reference to the given object
+
+        :param obj: The object to look for
+        :return: The index of its reference, or None
+        """
+        if isinstance(obj, (BYTES_TYPE, UNICODE_TYPE)):
+            return self._references_strings.get(obj)
+
+        idx = self._references_ids.get(id(obj))
+        if idx is None:
+            # Equal classes and enums share the same reference
+            if isinstance(obj, JavaClass):
+                for ref, ref_idx in self._references_classes.get(
+                    (obj.name, obj.serialVersionUID), ()
+                ):
+                    if ref == obj:
+                        return ref_idx
+            elif isinstance(obj, JavaEnum):
+                for ref, ref_idx in self._references_enums:
+                    if ref == obj:
+                        return ref_idx
+        return idx
 
     def _writeStreamHeader(self):  # pylint:disable=C0103
         """
         Writes the Java serialization magic header in the serialization stream
         """
-        self._writeStruct(
-            ">HH",
-            4,
-            (StreamConstants.STREAM_MAGIC, StreamConstants.STREAM_VERSION),
-        )
+        self._write(_STREAM_HEADER)
 
     def writeObject(self, obj):  # pylint:disable=C0103
         """
@@ -137,8 +315,11 @@ class JavaObjectMarshaller:
         :param obj: A string or a deserialized Java object
         :raise RuntimeError: Unsupported type
         """
-        log_debug("Writing object of type {0}".format(type(obj).__name__))
-        if isinstance(obj, JavaArray):
+        _log.debug("Writing object of type %s", type(obj).__name__)
+        writer = self._bean_writers.get(type(obj))
+        if writer is not None:
+            writer(obj)
+        elif isinstance(obj, JavaArray):
             # Deserialized Java array
             self.write_array(obj)
         elif isinstance(obj, JavaByteArray):
@@ -178,7 +359,7 @@ class JavaObjectMarshaller:
         :param args: Struct arguments
         """
         ba = struct.pack(unpack, *args)
-        self.object_stream.write(ba)
+        self._write(ba)
 
     def _writeString(self, obj, use_reference=True):  # pylint:disable=C0103
         """
@@ -192,32 +373,27 @@ class JavaObjectMarshaller:
         string = to_bytes(obj, "utf-8")
 
         if use_reference and isinstance(obj, JavaString):
-            try:
-                idx = self.references.index(obj)
-            except ValueError:
+            idx = self._find_reference(obj)
+            if idx is None:
                 # First appearance of the string
-                self.references.append(obj)
-                logging.debug(
+                idx = self._add_reference(obj)
+                _log.debug(
                     "*** Adding ref 0x%X for string: %s",
-                    len(self.references)
-                    - 1
-                    + StreamConstants.BASE_REFERENCE_IDX,
+                    idx + StreamConstants.BASE_REFERENCE_IDX,
                     obj,
                 )
 
-                self._writeStruct(">H", 2, (len(string),))
-                self.object_stream.write(string)
+                self._write(_S_H.pack(len(string)) + string)
             else:
                 # Write a reference to the previous type
-                logging.debug(
+                _log.debug(
                     "*** Reusing ref 0x%X for string: %s",
                     idx + StreamConstants.BASE_REFERENCE_IDX,
                     obj,
                 )
                 self.write_reference(idx)
         else:
-            self._writeStruct(">H", 2, (len(string),))
-            self.object_stream.write(string)
+            self._write(_S_H.pack(len(string)) + string)
 
     def write_string(self, obj, use_reference=True):
         """
@@ -227,15 +403,14 @@ class JavaObjectMarshaller:
         :param use_reference: If True, allow writing a reference
         """
         if use_reference and isinstance(obj, JavaString):
-            try:
-                idx = self.references.index(obj)
-            except ValueError:
+            idx = self._find_reference(obj)
+            if idx is None:
                 # String is not referenced: let _writeString store it
-                self._writeStruct(">B", 1, (TerminalCode.TC_STRING,))
+                self._write(_TC_STRING)
                 self._writeString(obj, use_reference)
             else:
                 # Reuse the referenced string
-                logging.debug(
+                _log.debug(
                     "*** Reusing ref 0x%X for String: %s",
                     idx + StreamConstants.BASE_REFERENCE_IDX,
                     obj,
@@ -243,7 +418,7 @@ class JavaObjectMarshaller:
                 self.write_reference(idx)
         else:
             # Don't use references
-            self._writeStruct(">B", 1, (TerminalCode.TC_STRING,))
+            self._write(_TC_STRING)
             self._writeString(obj, use_reference)
 
     def write_enum(self, obj):
@@ -254,16 +429,15 @@ class JavaObjectMarshaller:
         """
         # FIXME: the output doesn't have the same references as the real
         # serializable form
-        self._writeStruct(">B", 1, (TerminalCode.TC_ENUM,))
+        self._write(_TC_ENUM)
 
-        try:
-            idx = self.references.index(obj)
-        except ValueError:
+        idx = self._find_reference(obj)
+        if idx is None:
             # New reference
-            self.references.append(obj)
-            logging.debug(
+            idx = self._add_reference(obj)
+            _log.debug(
                 "*** Adding ref 0x%X for enum: %s",
-                len(self.references) - 1 + StreamConstants.BASE_REFERENCE_IDX,
+                idx + StreamConstants.BASE_REFERENCE_IDX,
                 obj,
             )
 
@@ -287,21 +461,19 @@ class JavaObjectMarshaller:
         if length <= 256:
             # Small block data
             # TC_BLOCKDATA (unsigned byte)<size> (byte)[size]
-            self._writeStruct(">B", 1, (TerminalCode.TC_BLOCKDATA,))
-            self._writeStruct(">B", 1, (length,))
+            self._write(_S_BB.pack(TerminalCode.TC_BLOCKDATA, length))
         else:
             # Large block data
             # TC_BLOCKDATALONG (unsigned int)<size> (byte)[size]
-            self._writeStruct(">B", 1, (TerminalCode.TC_BLOCKDATALONG,))
-            self._writeStruct(">I", 1, (length,))
+            self._write(_S_BI.pack(TerminalCode.TC_BLOCKDATALONG, length))
 
-        self.object_stream.write(obj)
+        self._write(obj)
 
     def write_null(self):
         """
         Writes a "null" value
         """
-        self._writeStruct(">B", 1, (TerminalCode.TC_NULL,))
+        self._write(_TC_NULL)
 
     def write_object(self, obj, parent=None):
         """
@@ -317,39 +489,38 @@ class JavaObjectMarshaller:
                 obj = tmp_object
                 break
 
-        self._writeStruct(">B", 1, (TerminalCode.TC_OBJECT,))
+        self._write(_TC_OBJECT)
         cls = obj.get_class()
         self.write_classdesc(cls)
 
         # Add reference
-        self.references.append([])
-        logging.debug(
+        idx = self._add_reference([])
+        _log.debug(
             "*** Adding ref 0x%X for object %s",
-            len(self.references) - 1 + StreamConstants.BASE_REFERENCE_IDX,
+            idx + StreamConstants.BASE_REFERENCE_IDX,
             obj,
         )
 
-        all_names = collections.deque()
-        all_types = collections.deque()
-        tmpcls = cls
-        while tmpcls:
-            all_names.extendleft(reversed(tmpcls.fields_names))
-            all_types.extendleft(reversed(tmpcls.fields_types))
-            tmpcls = tmpcls.superclass
-        del tmpcls
+        fields_plan = self._get_fields_plan(cls)
+        _log.debug("<=> Fields: %s", fields_plan)
 
-        logging.debug("<=> Field names: %s", all_names)
-        logging.debug("<=> Field types: %s", all_types)
-
-        for field_name, field_type in zip(all_names, all_types):
+        write = self._write
+        log_fields = _log.isEnabledFor(logging.DEBUG)
+        for field_name, field_type, packer in fields_plan:
             try:
-                logging.debug(
-                    "Writing field %s (%s): %s",
-                    field_name,
-                    field_type,
-                    getattr(obj, field_name),
-                )
-                self._write_value(field_type, getattr(obj, field_name))
+                value = getattr(obj, field_name)
+                if log_fields:
+                    _log.debug(
+                        "Writing field %s (%s): %s",
+                        field_name,
+                        field_type,
+                        value,
+                    )
+
+                if packer is not None:
+                    write(packer(value))
+                else:
+                    self._write_value(field_type, value)
             except AttributeError as ex:
                 log_error(
                     "No attribute {0} for object {1}\nDir: {2}".format(
@@ -357,7 +528,6 @@ class JavaObjectMarshaller:
                     )
                 )
                 raise
-        del all_names, all_types
 
         if (
             cls.flags & ClassDescFlags.SC_SERIALIZABLE
@@ -366,16 +536,44 @@ class JavaObjectMarshaller:
             and cls.flags & ClassDescFlags.SC_BLOCK_DATA
         ):
             for annotation in obj.annotations:
-                log_debug(
-                    "Write annotation {0} for {1}".format(
-                        repr(annotation), repr(obj)
-                    )
-                )
+                _log.debug("Write annotation %r for %r", annotation, obj)
                 if annotation is None:
                     self.write_null()
                 else:
                     self.writeObject(annotation)
-            self._writeStruct(">B", 1, (TerminalCode.TC_ENDBLOCKDATA,))
+            self._write(_TC_ENDBLOCKDATA)
+
+    def _get_fields_plan(self, cls):
+        """
+        Returns the fields of the given class and of its parents, starting
+        from the root of the hierarchy, with the packer of primitive values.
+        The result is cached during a dump.
+
+        :param cls: A JavaClass
+        :return: A list of (field name, field type, packer or None) tuples
+        """
+        try:
+            return self._fields_cache[id(cls)][1]
+        except KeyError:
+            pass
+
+        hierarchy = []
+        tmpcls = cls
+        while tmpcls:
+            hierarchy.append(tmpcls)
+            tmpcls = tmpcls.superclass
+        hierarchy.reverse()
+
+        fields_plan = [
+            (field_name, field_type, _PRIMITIVE_PACKERS.get(field_type))
+            for tmpcls in hierarchy
+            for field_name, field_type in zip(
+                tmpcls.fields_names, tmpcls.fields_types
+            )
+        ]
+        # Keep a reference to the class, so that its ID can't be reused
+        self._fields_cache[id(cls)] = (cls, fields_plan)
+        return fields_plan
 
     def write_class(self, obj, parent=None):  # pylint:disable=W0613
         """
@@ -384,7 +582,7 @@ class JavaObjectMarshaller:
         :param obj: A JavaClass object
         :param parent:
         """
-        self._writeStruct(">B", 1, (TerminalCode.TC_CLASS,))
+        self._write(_TC_CLASS)
         self.write_classdesc(obj)
 
     def write_classdesc(self, obj, parent=None):  # pylint:disable=W0613
@@ -394,76 +592,96 @@ class JavaObjectMarshaller:
         :param obj: Class description to write
         :param parent:
         """
-        if obj not in self.references:
+        idx = self._find_reference(obj)
+        if idx is None:
             # Add reference
-            self.references.append(obj)
-            logging.debug(
+            idx = self._add_reference(obj)
+            _log.debug(
                 "*** Adding ref 0x%X for classdesc %s",
-                len(self.references) - 1 + StreamConstants.BASE_REFERENCE_IDX,
+                idx + StreamConstants.BASE_REFERENCE_IDX,
                 obj.name,
             )
 
-            self._writeStruct(">B", 1, (TerminalCode.TC_CLASSDESC,))
-            self._writeString(obj.name)
-            self._writeStruct(">qB", 1, (obj.serialVersionUID, obj.flags))
-            self._writeStruct(">H", 1, (len(obj.fields_names),))
+            # Class names are never references: write the whole header
+            # TC_CLASSDESC (utf)<name> (long)<uid> (byte)<flags> (short)<count>
+            name = to_bytes(obj.name, "utf-8")
+            self._write(
+                _TC_CLASSDESC
+                + _S_H.pack(len(name))
+                + name
+                + _S_qBH.pack(
+                    obj.serialVersionUID, obj.flags, len(obj.fields_names)
+                )
+            )
 
-            for field_name, field_type in zip(
-                obj.fields_names, obj.fields_types
+            for field_name, name, field_type in zip(
+                obj.fields_names,
+                self._get_fields_names_bytes(obj),
+                obj.fields_types,
             ):
-                self._writeStruct(
-                    ">B", 1, (self._convert_type_to_char(field_type),)
-                )
-                self._writeString(field_name)
-                if ord(field_type[0]) in (
-                    TypeCode.TYPE_OBJECT,
-                    TypeCode.TYPE_ARRAY,
-                ):
-                    try:
-                        idx = self.references.index(field_type)
-                    except ValueError:
+                # Field names are never references either
+                # (byte)<type code> (utf)<field name>
+                type_char = self._get_type_char(field_type)
+                self._write(_S_BH.pack(type_char, len(name)) + name)
+                if type_char in (TypeCode.TYPE_OBJECT, TypeCode.TYPE_ARRAY):
+                    type_idx = self._find_reference(field_type)
+                    if type_idx is None:
                         # First appearance of the type
-                        self.references.append(field_type)
-                        logging.debug(
+                        type_idx = self._add_reference(field_type)
+                        _log.debug(
                             "*** Adding ref 0x%X for field type %s",
-                            len(self.references)
-                            - 1
-                            + StreamConstants.BASE_REFERENCE_IDX,
+                            type_idx + StreamConstants.BASE_REFERENCE_IDX,
                             field_type,
                         )
 
                         self.write_string(field_type, False)
                     else:
                         # Write a reference to the previous type
-                        logging.debug(
+                        _log.debug(
                             "*** Reusing ref 0x%X for %s (%s)",
-                            idx + StreamConstants.BASE_REFERENCE_IDX,
+                            type_idx + StreamConstants.BASE_REFERENCE_IDX,
                             field_type,
                             field_name,
                         )
-                        self.write_reference(idx)
+                        self.write_reference(type_idx)
 
-            self._writeStruct(">B", 1, (TerminalCode.TC_ENDBLOCKDATA,))
+            self._write(_TC_ENDBLOCKDATA)
             if obj.superclass:
                 self.write_classdesc(obj.superclass)
             else:
                 self.write_null()
         else:
             # Use reference
-            self.write_reference(self.references.index(obj))
+            self.write_reference(idx)
+
+    @staticmethod
+    def _get_fields_names_bytes(cls):
+        """
+        Returns the UTF-8 form of the names of the fields of the given class.
+        It is kept in the class, with the names it has been computed from.
+
+        :param cls: A JavaClass
+        :return: A tuple of encoded field names
+        """
+        names = tuple(cls.fields_names)
+        cached = getattr(cls, "_fields_names_bytes", None)
+        if cached is not None and cached[0] == names:
+            return cached[1]
+
+        names_bytes = tuple(to_bytes(name, "utf-8") for name in names)
+        cls._fields_names_bytes = (names, names_bytes)  # pylint:disable=W0212
+        return names_bytes
 
     def write_reference(self, ref_index):
         """
         Writes a reference
         :param ref_index: Local index (0-based) to the reference
         """
-        self._writeStruct(
-            ">BL",
-            1,
-            (
+        self._write(
+            _S_BL.pack(
                 TerminalCode.TC_REFERENCE,
                 ref_index + StreamConstants.BASE_REFERENCE_IDX,
-            ),
+            )
         )
 
     def write_array(self, obj):
@@ -473,32 +691,56 @@ class JavaObjectMarshaller:
         :param obj: A JavaArray object
         """
         classdesc = obj.get_class()
-        self._writeStruct(">B", 1, (TerminalCode.TC_ARRAY,))
+        self._write(_TC_ARRAY)
         self.write_classdesc(classdesc)
-        self._writeStruct(">i", 1, (len(obj),))
+        self._write(_S_i.pack(len(obj)))
 
         # Add reference
-        self.references.append(obj)
-        logging.debug(
+        idx = self._add_reference(obj)
+        _log.debug(
             "*** Adding ref 0x%X for array []",
-            len(self.references) - 1 + StreamConstants.BASE_REFERENCE_IDX,
+            idx + StreamConstants.BASE_REFERENCE_IDX,
         )
 
         array_type_code = TypeCode(ord(classdesc.name[0]))
         assert array_type_code == TypeCode.TYPE_ARRAY
         type_code = TypeCode(ord(classdesc.name[1]))
 
-        if type_code == TypeCode.TYPE_OBJECT:
+        if type_code in (TypeCode.TYPE_OBJECT, TypeCode.TYPE_ARRAY):
+            # Objects and sub-arrays (which can be null)
+            write_value = self._write_value
+            element_type = classdesc.name[1:]
             for o in obj:
-                self._write_value(classdesc.name[1:], o)
-        elif type_code == TypeCode.TYPE_ARRAY:
-            for a in obj:
-                self.write_array(a)
+                write_value(element_type, o)
         else:
-            log_debug("Write array of type {0}".format(chr(type_code.value)))
+            _log.debug("Write array of type %s", chr(type_code.value))
+            array_code = _ARRAY_TYPECODES.get(type_code)
+            if array_code is not None:
+                if type_code == TypeCode.TYPE_CHAR:
+                    values = map(ord, obj)
+                elif type_code == TypeCode.TYPE_BOOLEAN:
+                    values = map(bool, obj)
+                else:
+                    values = obj
+
+                try:
+                    # Convert the whole array to big-endian at once
+                    content = array.array(array_code, values)
+                except (OverflowError, TypeError):
+                    # Let the packers of each value raise the error
+                    pass
+                else:
+                    if sys.byteorder == "little":
+                        content.byteswap()
+                    self._write(content.tobytes())
+                    return
+
+            log_values = _log.isEnabledFor(logging.DEBUG)
+            write_value = self._write_value
             for v in obj:
-                log_debug("Writing: %s" % v)
-                self._write_value(type_code, v)
+                if log_values:
+                    _log.debug("Writing: %s", v)
+                write_value(type_code, v)
 
     def _write_value(self, raw_field_type, value):
         """
@@ -507,30 +749,19 @@ class JavaObjectMarshaller:
         :param raw_field_type: Value type
         :param value: The value itself
         """
-        if isinstance(raw_field_type, (TypeCode, int)):
-            field_type = raw_field_type
-        else:
-            # We don't need details for arrays and objects
-            field_type = TypeCode(ord(raw_field_type[0]))
-
-        if field_type == TypeCode.TYPE_BOOLEAN:
-            self._writeStruct(">B", 1, (1 if value else 0,))
-        elif field_type == TypeCode.TYPE_BYTE:
-            self._writeStruct(">b", 1, (value,))
-        elif field_type == TypeCode.TYPE_CHAR:
-            self._writeStruct(">H", 1, (ord(value),))
-        elif field_type == TypeCode.TYPE_SHORT:
-            self._writeStruct(">h", 1, (value,))
-        elif field_type == TypeCode.TYPE_INTEGER:
-            self._writeStruct(">i", 1, (value,))
-        elif field_type == TypeCode.TYPE_LONG:
-            self._writeStruct(">q", 1, (value,))
-        elif field_type == TypeCode.TYPE_FLOAT:
-            self._writeStruct(">f", 1, (value,))
-        elif field_type == TypeCode.TYPE_DOUBLE:
-            self._writeStruct(">d", 1, (value,))
-        elif field_type in (TypeCode.TYPE_OBJECT, TypeCode.TYPE_ARRAY):
-            if value is None:
+        # Primitive type code or type character
+        packer = _PRIMITIVE_PACKERS.get(raw_field_type)
+        if packer is not None:
+            self._write(packer(value))
+            return
+
+        # We don't need details for arrays and objects
+        field_type = self._get_type_char(raw_field_type)
+        if field_type in (TypeCode.TYPE_OBJECT, TypeCode.TYPE_ARRAY):
+            writer = self._bean_writers.get(type(value))
+            if writer is not None:
+                writer(value)
+            elif value is None:
                 self.write_null()
             elif isinstance(value, JavaEnum):
                 self.write_enum(value)
@@ -549,6 +780,20 @@ class JavaObjectMarshaller:
         else:
             raise RuntimeError("Unknown typecode: {0}".format(field_type))
 
+    def _get_type_char(self, field_type):
+        """
+        Returns the type code value of the given field type, memoized
+
+        :param field_type: A field type, type code or type code value
+        :return: The type code value (int)
+        """
+        try:
+            return self._type_chars[field_type]
+        except KeyError:
+            type_char = self._convert_type_to_char(field_type)
+            self._type_chars[field_type] = type_char
+            return type_char
+
     @staticmethod
     def _convert_type_to_char(type_char):
         """
@@ -28,22 +28,38 @@ Implementation of the object transformers in v1 parser
 from __future__ import absolute_import
 
 from typing import Callable, Dict
-import functools
+import logging
+import struct
 
 from .beans import JavaClass, JavaObject
 from .unmarshaller import JavaObjectUnmarshaller
-from ..constants import ClassDescFlags, TerminalCode, TypeCode
+from ..constants import ClassDescFlags, TerminalCode
 from ..utils import (
     log_debug,
     log_error,
-    to_bytes,
-    read_struct,
-    read_string,
+    read_string_from,
+    BYTES_TYPE,
 )
 
 
 __all__ = ("DefaultObjectTransformer",)
 
+# Logger of the module (same as the one of the utility methods)
+_log = logging.getLogger("javaobj")
+
+# Structures of the java.time content
+_S_b = struct.Struct(">b")
+_S_bb = struct.Struct(">bb")
+_S_bbb = struct.Struct(">bbb")
+_S_i = struct.Struct(">i")
+_S_ib = struct.Struct(">ib")
+_S_ibb = struct.Struct(">ibb")
+_S_iii = struct.Struct(">iii")
+_S_qi = struct.Struct(">qi")
+
+# Zone offsets in seconds, by signed offset byte (in quarters of hour)
+_ZONE_OFFSETS = tuple(quarters * 900 for quarters in range(-128, 128))
+
 
 class DefaultObjectTransformer(object):  # pylint:disable=R0205
     """
@@ -58,7 +74,7 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
 
         def __init__(self, unmarshaller):
             # type: (JavaObjectUnmarshaller) -> None
-            list.__init__(self)
+            # The list is created empty: no need to call list.__init__()
             JavaObject.__init__(self)
 
         def __hash__(self):
@@ -70,14 +86,16 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
             Loads the content of the map, written with a custom implementation
             """
             # Lists have their content in there annotations
-            self.extend(self.annotations[1:])
+            list.extend(self, self.annotations[1:])
 
-    @functools.total_ordering
     class JavaPrimitiveClass(JavaObject):
         """
         Parent of Java classes matching a primitive (Bool, Integer, Long, ...)
         """
 
+        # The boxed value is stored in a slot, not in the instance dictionary
+        __slots__ = ("value",)
+
         def __init__(self, unmarshaller):
             JavaObject.__init__(self)
             self.value = None
@@ -94,9 +112,21 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
         def __eq__(self, other):
             return self.value == other
 
+        def __ne__(self, other):
+            return self.value != other
+
         def __lt__(self, other):
             return self.value < other
 
+        def __le__(self, other):
+            return self.value <= other
+
+        def __gt__(self, other):
+            return self.value > other
+
+        def __ge__(self, other):
+            return self.value >= other
+
     class JavaBool(JavaPrimitiveClass):
         def __bool__(self):
             return self.value
@@ -112,7 +142,7 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
 
         def __init__(self, unmarshaller):
             # type: (JavaObjectUnmarshaller) -> None
-            dict.__init__(self)
+            # The dict is created empty: no need to call dict.__init__()
             JavaObject.__init__(self)
 
         def __hash__(self):
@@ -123,10 +153,10 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
             """
             Loads the content of the map, written with a custom implementation
             """
-            # Group annotation elements 2 by 2
-            args = [iter(self.annotations[1:])] * 2
-            for key, value in zip(*args):
-                self[key] = value
+            # Group annotation elements 2 by 2, skipping the first one
+            annotations = iter(self.annotations)
+            next(annotations, None)
+            self.update(zip(annotations, annotations))
 
     class JavaLinkedHashMap(JavaMap):
         def __extra_loading__(self, unmarshaller, ident=0):
@@ -139,17 +169,15 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
             if opid != ClassDescFlags.SC_BLOCK_DATA:
                 raise ValueError("Start of block data not found")
 
-            # Read HashMap fields
-            self.buckets = unmarshaller._read_value(
-                TypeCode.TYPE_INTEGER, ident
-            )
-            self.size = unmarshaller._read_value(TypeCode.TYPE_INTEGER, ident)
+            # Read HashMap fields: (int)<buckets> (int)<size>
+            self.buckets, self.size = unmarshaller._readStruct(">ii")
 
-            # Read entries
-            for _ in range(self.size):
-                key = unmarshaller._read_and_exec_opcode()[1]
-                value = unmarshaller._read_and_exec_opcode()[1]
-                self[key] = value
+            # Read entries: the size comes from the stream, so don't
+            # preallocate them
+            read_value = unmarshaller._read_value_only
+            dict.update(
+                self, ((read_value(), read_value()) for _ in range(self.size))
+            )
 
             # Ignore the end of the blockdata
             unmarshaller._read_and_exec_opcode(
@@ -168,7 +196,7 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
 
         def __init__(self, unmarshaller):
             # type: (JavaObjectUnmarshaller) -> None
-            set.__init__(self)
+            # The set is created empty: no need to call set.__init__()
             JavaObject.__init__(self)
 
         def __hash__(self):
@@ -179,7 +207,7 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
             """
             Loads the content of the map, written with a custom implementation
             """
-            self.update(self.annotations[1:])
+            set.update(self, self.annotations[1:])
 
     class JavaTreeSet(JavaSet):
         def __extra_loading__(self, unmarshaller, ident=0):
@@ -188,7 +216,7 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
             Loads the content of the map, written with a custom implementation
             """
             # Annotation[1] == size of the set
-            self.update(self.annotations[2:])
+            set.update(self, self.annotations[2:])
 
     class JavaTime(JavaObject):
         """
@@ -213,36 +241,21 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
         MONTH_DAY_TYPE = 13
         PERIOD_TYPE = 14
 
+        # Default values, overridden by the instances when loaded
+        type = -1
+        year = None
+        month = None
+        day = None
+        hour = None
+        minute = None
+        second = None
+        nano = None
+        offset = None
+        zone = None
+
         def __init__(self, unmarshaller):
             # type: (JavaObjectUnmarshaller) -> None
             JavaObject.__init__(self)
-            self.type = -1
-            self.year = None
-            self.month = None
-            self.day = None
-            self.hour = None
-            self.minute = None
-            self.second = None
-            self.nano = None
-            self.offset = None
-            self.zone = None
-
-            self.time_handlers = {
-                self.DURATION_TYPE: self.do_duration,
-                self.INSTANT_TYPE: self.do_instant,
-                self.LOCAL_DATE_TYPE: self.do_local_date,
-                self.LOCAL_DATE_TIME_TYPE: self.do_local_date_time,
-                self.LOCAL_TIME_TYPE: self.do_local_time,
-                self.ZONE_DATE_TIME_TYPE: self.do_zoned_date_time,
-                self.ZONE_OFFSET_TYPE: self.do_zone_offset,
-                self.ZONE_REGION_TYPE: self.do_zone_region,
-                self.OFFSET_TIME_TYPE: self.do_offset_time,
-                self.OFFSET_DATE_TIME_TYPE: self.do_offset_date_time,
-                self.YEAR_TYPE: self.do_year,
-                self.YEAR_MONTH_TYPE: self.do_year_month,
-                self.MONTH_DAY_TYPE: self.do_month_day,
-                self.PERIOD_TYPE: self.do_period,
-            }
 
         def __str__(self):
             return (
@@ -259,99 +272,149 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
             """
             # Convert back annotations to bytes
             # latin-1 is used to ensure that bytes are kept as is
-            content = to_bytes(self.annotations[0], "latin1")
-            (self.type,), content = read_struct(content, ">b")
-
-            try:
-                self.time_handlers[self.type](unmarshaller, content)
-            except KeyError as ex:
-                log_error("Unhandled kind of time: {}".format(ex))
-
-        def do_duration(self, unmarshaller, data):
-            (self.second, self.nano), data = read_struct(data, ">qi")
-            return data
-
-        def do_instant(self, unmarshaller, data):
-            (self.second, self.nano), data = read_struct(data, ">qi")
-            return data
-
-        def do_local_date(self, unmarshaller, data):
-            (self.year, self.month, self.day), data = read_struct(data, ">ibb")
-            return data
+            content = self.annotations[0]
+            if type(content) is not BYTES_TYPE:  # pylint:disable=C0123
+                content = content.encode("latin-1")
+            (self.type,) = _S_b.unpack_from(content)
+
+            handler = self.TIME_HANDLERS.get(self.type)
+            if handler is None:
+                log_error("Unhandled kind of time: {}".format(self.type))
+            else:
+                handler(self, unmarshaller, content, 1)
+
+        @staticmethod
+        def do_duration(obj, unmarshaller, data, offset):
+            obj.second, obj.nano = _S_qi.unpack_from(data, offset)
+            return offset + _S_qi.size
+
+        @staticmethod
+        def do_instant(obj, unmarshaller, data, offset):
+            obj.second, obj.nano = _S_qi.unpack_from(data, offset)
+            return offset + _S_qi.size
+
+        @staticmethod
+        def do_local_date(obj, unmarshaller, data, offset):
+            obj.year, obj.month, obj.day = _S_ibb.unpack_from(data, offset)
+            return offset + _S_ibb.size
+
+        @staticmethod
+        def do_local_time(obj, unmarshaller, data, offset):
+            # Read hour, minute and second at once, then only consume the
+            # bytes which were written
+            if len(data) - offset >= 3:
+                values = _S_bbb.unpack_from(data, offset)
+            else:
+                values = struct.unpack_from(
+                    ">{0}b".format(len(data) - offset), data, offset
+                )
 
-        def do_local_time(self, unmarshaller, data):
-            (hour,), data = read_struct(data, ">b")
+            hour = values[0]
             minute = 0
             second = 0
             nano = 0
 
             if hour < 0:
                 hour = ~hour
+                offset += 1
             else:
-                (minute,), data = read_struct(data, ">b")
+                minute = values[1]
                 if minute < 0:
                     minute = ~minute
+                    offset += 2
                 else:
-                    (second,), data = read_struct(data, ">b")
+                    second = values[2]
                     if second < 0:
                         second = ~second
+                        offset += 3
                     else:
-                        (nano,), data = read_struct(data, ">i")
-
-            self.hour = hour
-            self.minute = minute
-            self.second = second
-            self.nano = nano
-            return data
-
-        def do_local_date_time(self, unmarshaller, data):
-            data = self.do_local_date(unmarshaller, data)
-            data = self.do_local_time(unmarshaller, data)
-            return data
-
-        def do_zoned_date_time(self, unmarshaller, data):
-            data = self.do_local_date_time(unmarshaller, data)
-            data = self.do_zone_offset(unmarshaller, data)
-            data = self.do_zone_region(unmarshaller, data)
-            return data
-
-        def do_zone_offset(self, unmarshaller, data):
-            (offset_byte,), data = read_struct(data, ">b")
+                        (nano,) = _S_i.unpack_from(data, offset + 3)
+                        offset += 3 + _S_i.size
+
+            obj.hour = hour
+            obj.minute = minute
+            obj.second = second
+            obj.nano = nano
+            return offset
+
+        @staticmethod
+        def do_local_date_time(obj, unmarshaller, data, offset):
+            offset = obj.do_local_date(obj, unmarshaller, data, offset)
+            offset = obj.do_local_time(obj, unmarshaller, data, offset)
+            return offset
+
+        @staticmethod
+        def do_zoned_date_time(obj, unmarshaller, data, offset):
+            offset = obj.do_local_date_time(obj, unmarshaller, data, offset)
+            offset = obj.do_zone_offset(obj, unmarshaller, data, offset)
+            offset = obj.do_zone_region(obj, unmarshaller, data, offset)
+            return offset
+
+        @staticmethod
+        def do_zone_offset(obj, unmarshaller, data, offset):
+            (offset_byte,) = _S_b.unpack_from(data, offset)
+            offset += 1
             if offset_byte == 127:
-                (self.offset,), data = read_struct(data, ">i")
+                (obj.offset,) = _S_i.unpack_from(data, offset)
+                offset += 4
             else:
-                self.offset = offset_byte * 900
-            return data
-
-        def do_zone_region(self, unmarshaller, data):
-            self.zone, data = read_string(data)
-            return data
-
-        def do_offset_time(self, unmarshaller, data):
-            data = self.do_local_time(unmarshaller, data)
-            data = self.do_zone_offset(unmarshaller, data)
-            return data
-
-        def do_offset_date_time(self, unmarshaller, data):
-            data = self.do_local_date_time(unmarshaller, data)
-            data = self.do_zone_offset(unmarshaller, data)
-            return data
-
-        def do_year(self, unmarshaller, data):
-            (self.year,), data = read_struct(data, ">i")
-            return data
-
-        def do_year_month(self, unmarshaller, data):
-            (self.year, self.month), data = read_struct(data, ">ib")
-            return data
-
-        def do_month_day(self, unmarshaller, data):
-            (self.month, self.day), data = read_struct(data, ">bb")
-            return data
-
-        def do_period(self, unmarshaller, data):
-            (self.year, self.month, self.day), data = read_struct(data, ">iii")
-            return data
+                obj.offset = _ZONE_OFFSETS[offset_byte + 128]
+            return offset
+
+        @staticmethod
+        def do_zone_region(obj, unmarshaller, data, offset):
+            obj.zone, offset = read_string_from(data, offset)
+            return offset
+
+        @staticmethod
+        def do_offset_time(obj, unmarshaller, data, offset):
+            offset = obj.do_local_time(obj, unmarshaller, data, offset)
+            offset = obj.do_zone_offset(obj, unmarshaller, data, offset)
+            return offset
+
+        @staticmethod
+        def do_offset_date_time(obj, unmarshaller, data, offset):
+            offset = obj.do_local_date_time(obj, unmarshaller, data, offset)
+            offset = obj.do_zone_offset(obj, unmarshaller, data, offset)
+            return offset
+
+        @staticmethod
+        def do_year(obj, unmarshaller, data, offset):
+            (obj.year,) = _S_i.unpack_from(data, offset)
+            return offset + _S_i.size
+
+        @staticmethod
+        def do_year_month(obj, unmarshaller, data, offset):
+            obj.year, obj.month = _S_ib.unpack_from(data, offset)
+            return offset + _S_ib.size
+
+        @staticmethod
+        def do_month_day(obj, unmarshaller, data, offset):
+            obj.month, obj.day = _S_bb.unpack_from(data, offset)
+            return offset + _S_bb.size
+
+        @staticmethod
+        def do_period(obj, unmarshaller, data, offset):
+            obj.year, obj.month, obj.day = _S_iii.unpack_from(data, offset)
+            return offset + _S_iii.size
+
+        # Kind of time -> handler (the function of the static method)
+        TIME_HANDLERS = {
+            DURATION_TYPE: do_duration.__func__,
+            INSTANT_TYPE: do_instant.__func__,
+            LOCAL_DATE_TYPE: do_local_date.__func__,
+            LOCAL_DATE_TIME_TYPE: do_local_date_time.__func__,
+            LOCAL_TIME_TYPE: do_local_time.__func__,
+            ZONE_DATE_TIME_TYPE: do_zoned_date_time.__func__,
+            ZONE_OFFSET_TYPE: do_zone_offset.__func__,
+            ZONE_REGION_TYPE: do_zone_region.__func__,
+            OFFSET_TIME_TYPE: do_offset_time.__func__,
+            OFFSET_DATE_TIME_TYPE: do_offset_date_time.__func__,
+            YEAR_TYPE: do_year.__func__,
+            YEAR_MONTH_TYPE: do_year_month.__func__,
+            MONTH_DAY_TYPE: do_month_day.__func__,
+            PERIOD_TYPE: do_period.__func__,
+        }
 
     TYPE_MAPPER = {
         "java.util.ArrayList": JavaList,
@@ -376,17 +439,17 @@ class DefaultObjectTransformer(object):  # pylint:disable=R0205
         :param classdesc: The description of a Java class
         :return: The Python form of the object, or the original JavaObject
         """
-        try:
-            mapped_type = self.TYPE_MAPPER[classdesc.name]
-        except KeyError:
+        mapped_type = self.TYPE_MAPPER.get(classdesc.name)
+        if mapped_type is None:
             # Return a JavaObject by default
             return JavaObject()
-        else:
+
+        java_object = mapped_type(unmarshaller)
+
+        if _log.isEnabledFor(logging.DEBUG):
             log_debug("---")
             log_debug(classdesc.name)
             log_debug("---")
-
-            java_object = mapped_type(unmarshaller)
-
             log_debug(">>> java_object: {0}".format(java_object))
-            return java_object
+
+        return java_object
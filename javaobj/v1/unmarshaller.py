@@ -37,6 +37,8 @@ from __future__ import absolute_import
 
 # Standard library
 from typing import Any, Union
+import io
+import logging
 import os
 import struct
 
@@ -63,10 +65,14 @@ from ..utils import (
     to_unicode,
     unicode_char,
     hexdump,
+    intern_str,
 )
 
 numpy = None  # Imported only when really used
 
+# Logger of the module (same as the one of the utility methods)
+_log = logging.getLogger("javaobj")
+
 # ------------------------------------------------------------------------------
 
 __all__ = ("JavaObjectUnmarshaller",)
@@ -80,14 +86,93 @@ __docformat__ = "restructuredtext en"
 
 # ------------------------------------------------------------------------------
 
+# Pre-compiled structs, by format (completed on demand by _readStruct)
+_PACKERS = {
+    fmt: struct.Struct(fmt)
+    for fmt in (
+        ">B",
+        ">b",
+        ">H",
+        ">h",
+        ">I",
+        ">i",
+        ">L",
+        ">q",
+        ">Q",
+        ">f",
+        ">d",
+        ">HH",
+        ">qB",
+        ">qBH",
+        ">ii",
+    )
+}
+_S_B = _PACKERS[">B"]
+_S_b = _PACKERS[">b"]
+_S_H = _PACKERS[">H"]
+_S_h = _PACKERS[">h"]
+_S_i = _PACKERS[">i"]
+_S_q = _PACKERS[">q"]
+_S_f = _PACKERS[">f"]
+_S_d = _PACKERS[">d"]
+_S_qBH = _PACKERS[">qBH"]
+
+# Format of the length of a string -> pre-compiled struct
+_STRING_LENGTH_PACKERS = {"H": _S_H, "Q": _PACKERS[">Q"]}
+
+# Java type char -> (pre-compiled struct, conversion method) of primitives
+_PRIMITIVE_READERS = {
+    TypeCode.TYPE_BOOLEAN: (_S_B, bool),
+    TypeCode.TYPE_BYTE: (_S_b, None),
+    # TYPE_CHAR is defined by the serialization specification but not used
+    # in the implementation, so this is a hypothetical code
+    TypeCode.TYPE_CHAR: (_S_H, unicode_char),
+    TypeCode.TYPE_SHORT: (_S_h, None),
+    TypeCode.TYPE_INTEGER: (_S_i, None),
+    TypeCode.TYPE_LONG: (_S_q, None),
+    TypeCode.TYPE_FLOAT: (_S_f, None),
+    TypeCode.TYPE_DOUBLE: (_S_d, None),
+}
+
+# Handle of the first reference
+_BASE_REFERENCE_IDX = StreamConstants.BASE_REFERENCE_IDX
+
+# Integer value -> TypeCode
+_TYPE_CODES = {type_code.value: type_code for type_code in TypeCode}
+
+# Maximum number of decoded strings kept by an unmarshaller
+_STRINGS_CACHE_SIZE = 4096
+
+# Strings longer than this (in bytes) are decoded without being cached
+_STRINGS_CACHE_MAX_LENGTH = 256
+
+# Java type char -> (struct format, item size) of the primitive arrays items
+ARRAY_FORMAT_MAP = {
+    TypeCode.TYPE_BYTE: ("b", 1),
+    TypeCode.TYPE_CHAR: ("H", 2),
+    TypeCode.TYPE_DOUBLE: ("d", 8),
+    TypeCode.TYPE_FLOAT: ("f", 4),
+    TypeCode.TYPE_INTEGER: ("i", 4),
+    TypeCode.TYPE_LONG: ("q", 8),
+    TypeCode.TYPE_SHORT: ("h", 2),
+    TypeCode.TYPE_BOOLEAN: ("B", 1),
+}
+
+# Primitive TypeCode -> JavaString of its char value, used as field type
+_PRIMITIVE_TYPES_NAMES = {
+    type_code: JavaString(str(chr(type_code.value)))
+    for type_code in ARRAY_FORMAT_MAP
+}
+
 # Convertion of a Java type char to its NumPy equivalent
+# (item sizes must match the ones of ARRAY_FORMAT_MAP)
 NUMPY_TYPE_MAP = {
     TypeCode.TYPE_BYTE: "B",
-    TypeCode.TYPE_CHAR: "b",
+    TypeCode.TYPE_CHAR: ">u2",
     TypeCode.TYPE_DOUBLE: ">d",
     TypeCode.TYPE_FLOAT: ">f",
     TypeCode.TYPE_INTEGER: ">i",
-    TypeCode.TYPE_LONG: ">l",
+    TypeCode.TYPE_LONG: ">i8",
     TypeCode.TYPE_SHORT: ">h",
     TypeCode.TYPE_BOOLEAN: ">B",
 }
@@ -95,6 +180,19 @@ NUMPY_TYPE_MAP = {
 # ------------------------------------------------------------------------------
 
 
+def _is_cheaply_seekable(stream):
+    """
+    Checks if the end of the given stream can be reached without reading it,
+    i.e. if it is an in-memory stream or a file
+
+    :param stream: An input stream
+    :return: True if seeking to the end of the stream is cheap
+    """
+    if isinstance(stream, io.BufferedReader):
+        stream = stream.raw
+    return isinstance(stream, (io.BytesIO, io.FileIO))
+
+
 class JavaObjectUnmarshaller:
     """
     Deserializes a Java serialization stream
@@ -140,13 +238,25 @@ class JavaObjectUnmarshaller:
             TerminalCode.TC_ENDBLOCKDATA: self.do_null,
         }
 
+        # Opcode -> Reading method jump table (None for unknown opcodes)
+        self._ophandlers = [None] * 256
+        for opcode, handler in self.opmap.items():
+            self._ophandlers[opcode] = handler
+
+        # Debug logs are only prepared if enabled when starting to read
+        self._debug = _log.isEnabledFor(logging.DEBUG)
+
         # Set up members
         self.current_object = None
         self.reference_counter = 0
         self.references = []
+        self._ref_append = self.references.append
         self.object_transformers = []
         self.object_stream = stream
 
+        # Raw bytes -> decoded string cache
+        self._strings_cache = {}
+
         # Read the stream header (magic & version)
         self._readStreamHeader()
 
@@ -159,29 +269,85 @@ class JavaObjectUnmarshaller:
         :return: The unmarshalled object
         :raise Exception: Any exception that occurred during unmarshalling
         """
+        raw_stream = None
+        if isinstance(self.object_stream, io.RawIOBase):
+            # Buffer raw streams, to avoid a system call per read
+            raw_stream = self.object_stream
+            self.object_stream = io.BufferedReader(raw_stream)
+
         try:
             # TODO: add expects
-            _, res = self._read_and_exec_opcode(ident=0)
+            res = self._read_value_only()
 
             position_bak = self.object_stream.tell()
-            the_rest = self.object_stream.read()
-            if not ignore_remaining_data and len(the_rest) != 0:
+            remaining = None
+            if _is_cheaply_seekable(self.object_stream):
+                try:
+                    # Compute the size of the remaining data without
+                    # reading it
+                    self.object_stream.seek(0, os.SEEK_END)
+                    remaining = self.object_stream.tell() - position_bak
+                    self.object_stream.seek(position_bak)
+                    the_rest = None
+                except (IOError, ValueError):
+                    # Includes io.UnsupportedOperation
+                    self.object_stream.seek(position_bak)
+
+            if remaining is None:
+                the_rest = self.object_stream.read()
+                remaining = len(the_rest)
+
+            if not ignore_remaining_data and remaining != 0:
                 log_error(
                     "Warning!!!!: Stream still has {0} bytes left. "
                     "Enable debug mode of logging to see the hexdump.".format(
-                        len(the_rest)
+                        remaining
                     )
                 )
-                log_debug("\n{0}".format(hexdump(the_rest)))
-            else:
+                if self._debug:
+                    if the_rest is None:
+                        the_rest = self.object_stream.read()
+                    log_debug("\n{0}".format(hexdump(the_rest)))
+            elif self._debug:
                 log_debug("Java Object unmarshalled successfully!")
 
             self.object_stream.seek(position_bak)
-            return res
         except Exception:
+            if raw_stream is not None:
+                # Keep the parsing error
+                self._release_raw_stream(raw_stream, True)
             self._oops_dump_state(ignore_remaining_data)
             raise
 
+        if raw_stream is not None:
+            self._release_raw_stream(raw_stream)
+        return res
+
+    def _release_raw_stream(self, raw_stream, ignore_errors=False):
+        """
+        Gives back the raw stream buffered by readObject(), at the position
+        the parsing stopped at
+
+        :param raw_stream: The raw stream given to the unmarshaller
+        :param ignore_errors: If True, log errors instead of raising them
+        """
+        try:
+            try:
+                position = self.object_stream.tell()
+            finally:
+                # Don't let the buffered reader close the raw stream
+                self.object_stream.detach()
+                self.object_stream = raw_stream
+
+            raw_stream.seek(position)
+        except Exception as ex:  # pylint:disable=W0703
+            if not ignore_errors:
+                raise
+
+            log_error(
+                "Error restoring the raw stream position: {0}".format(ex)
+            )
+
     def add_transformer(self, transformer):
         """
         Appends an object transformer to the deserialization process
@@ -217,13 +383,14 @@ class JavaObjectUnmarshaller:
         :raise RuntimeError: Unknown opcode
         """
         position = self.object_stream.tell()
-        (opid,) = self._readStruct(">B")
-        log_debug(
-            "OpCode: 0x{0:X} -- {1} (at offset 0x{2:X})".format(
-                opid, StreamCodeDebug.op_id(opid), position
-            ),
-            ident,
-        )
+        (opid,) = self._readPacked(_S_B)
+        if self._debug:
+            log_debug(
+                "OpCode: 0x{0:X} -- {1} (at offset 0x{2:X})".format(
+                    opid, StreamCodeDebug.op_id(opid), position
+                ),
+                ident,
+            )
 
         if expect and opid not in expect:
             raise IOError(
@@ -233,15 +400,41 @@ class JavaObjectUnmarshaller:
                 )
             )
 
-        try:
-            handler = self.opmap[opid]
-        except KeyError:
+        handler = self._ophandlers[opid]
+        if handler is None:
             raise RuntimeError(
                 "Unknown OpCode in the stream: 0x{0:X} "
                 "(at offset 0x{1:X})".format(opid, position)
             )
-        else:
-            return opid, handler(ident=ident)
+        return opid, handler(ident=ident)
+
+    def _read_value_only(self, ident=0):
+        """
+        Reads the next opcode, and executes its handler.
+        Same as ``_read_and_exec_opcode``, without any expected opcodes and
+        without returning the read opcode.
+
+        :param ident: Log identation level
+        :return: The result of the handler
+        :raise RuntimeError: Unknown opcode
+        """
+        position = self.object_stream.tell()
+        (opid,) = self._readPacked(_S_B)
+        if self._debug:
+            log_debug(
+                "OpCode: 0x{0:X} -- {1} (at offset 0x{2:X})".format(
+                    opid, StreamCodeDebug.op_id(opid), position
+                ),
+                ident,
+            )
+
+        handler = self._ophandlers[opid]
+        if handler is None:
+            raise RuntimeError(
+                "Unknown OpCode in the stream: 0x{0:X} "
+                "(at offset 0x{1:X})".format(opid, position)
+            )
+        return handler(ident=ident)
 
     def _readStruct(self, unpack):
         """
@@ -251,7 +444,12 @@ class JavaObjectUnmarshaller:
         :return: The result of struct.unpack (tuple)
         :raise RuntimeError: End of stream reached during unpacking
         """
-        length = struct.calcsize(unpack)
+        try:
+            packer = _PACKERS[unpack]
+        except KeyError:
+            packer = _PACKERS[unpack] = struct.Struct(unpack)
+
+        length = packer.size
         ba = self.object_stream.read(length)
 
         if len(ba) != length:
@@ -259,7 +457,26 @@ class JavaObjectUnmarshaller:
                 "Stream has been ended unexpectedly while unmarshaling."
             )
 
-        return struct.unpack(unpack, ba)
+        return packer.unpack(ba)
+
+    def _readPacked(self, packer):
+        # type: (struct.Struct) -> tuple
+        """
+        Reads from the input stream, using a pre-compiled struct
+
+        :param packer: A struct.Struct object
+        :return: The result of packer.unpack (tuple)
+        :raise RuntimeError: End of stream reached during unpacking
+        """
+        length = packer.size
+        ba = self.object_stream.read(length)
+
+        if len(ba) != length:
+            raise RuntimeError(
+                "Stream has been ended unexpectedly while unmarshaling."
+            )
+
+        return packer.unpack(ba)
 
     def _readString(self, length_fmt="H"):
         """
@@ -269,9 +486,19 @@ class JavaObjectUnmarshaller:
         :return: The deserialized string
         :raise RuntimeError: Unexpected end of stream
         """
-        (length,) = self._readStruct(">{0}".format(length_fmt))
+        (length,) = self._readPacked(_STRING_LENGTH_PACKERS[length_fmt])
         ba = self.object_stream.read(length)
-        return to_unicode(ba)
+        if length > _STRINGS_CACHE_MAX_LENGTH:
+            return to_unicode(ba)
+
+        # Class names, field names, ... are repeated across the stream
+        try:
+            return self._strings_cache[ba]
+        except KeyError:
+            value = to_unicode(ba)
+            if len(self._strings_cache) < _STRINGS_CACHE_SIZE:
+                self._strings_cache[ba] = value
+            return value
 
     def do_classdesc(self, parent=None, ident=0):
         """
@@ -297,28 +524,33 @@ class JavaObjectUnmarshaller:
         # objectDesc:
         #   obj_typecode fieldName className1
         clazz = JavaClass()
-        log_debug("[classdesc]", ident)
-        class_name = self._readString()
+        if self._debug:
+            log_debug("[classdesc]", ident)
+        # Interned, as it will be looked up in the transformers
+        class_name = intern_str(self._readString())
         clazz.name = class_name
-        log_debug("Class name: %s" % class_name, ident)
+        if self._debug:
+            log_debug("Class name: %s" % class_name, ident)
 
-        # serialVersionUID is a Java (signed) long => 8 bytes
-        serialVersionUID, classDescFlags = self._readStruct(">qB")
+        # serialVersionUID is a Java (signed) long => 8 bytes, followed by
+        # classDescFlags and the number of fields: read them at once
+        serialVersionUID, classDescFlags, length = self._readPacked(_S_qBH)
         clazz.serialVersionUID = serialVersionUID
         clazz.flags = classDescFlags
 
         self._add_reference(clazz, ident)
 
-        log_debug(
-            "Serial: 0x{0:X} / {0:d} - classDescFlags: 0x{1:X} {2}".format(
-                serialVersionUID,
-                classDescFlags,
-                StreamCodeDebug.flags(classDescFlags),
-            ),
-            ident,
-        )
-        (length,) = self._readStruct(">H")
-        log_debug("Fields num: 0x{0:X}".format(length), ident)
+        if self._debug:
+            log_debug(
+                "Serial: 0x{0:X} / {0:d} - classDescFlags: 0x{1:X} {2}".format(
+                    serialVersionUID,
+                    classDescFlags,
+                    StreamCodeDebug.flags(classDescFlags),
+                ),
+                ident,
+            )
+        if self._debug:
+            log_debug("Fields num: 0x{0:X}".format(length), ident)
 
         clazz.fields_names = []
         clazz.fields_types = []
@@ -327,7 +559,8 @@ class JavaObjectUnmarshaller:
             field_name = self._readString()
             base_field_type = self._convert_char_to_type(typecode)
 
-            log_debug("> Reading field {0}".format(field_name), ident)
+            if self._debug:
+                log_debug("> Reading field {0}".format(field_name), ident)
 
             if base_field_type == TypeCode.TYPE_ARRAY:
                 _, field_type = self._read_and_exec_opcode(
@@ -357,15 +590,16 @@ class JavaObjectUnmarshaller:
                         "not {0}".format(type(field_type))
                     )
             else:
-                # Convert the TypeCode to its char value
-                field_type = JavaString(str(chr(base_field_type.value)))
+                # Shared JavaString of the TypeCode char value
+                field_type = _PRIMITIVE_TYPES_NAMES[base_field_type]
 
-            log_debug(
-                "< FieldName: 0x{0:X} Name:{1} Type:{2} ID:{3}".format(
-                    typecode, field_name, field_type, fieldId
-                ),
-                ident,
-            )
+            if self._debug:
+                log_debug(
+                    "< FieldName: 0x{0:X} Name:{1} Type:{2} ID:{3}".format(
+                        typecode, field_name, field_type, fieldId
+                    ),
+                    ident,
+                )
             assert field_name is not None
             assert field_type is not None
 
@@ -378,17 +612,19 @@ class JavaObjectUnmarshaller:
 
         # classAnnotation
         (opid,) = self._readStruct(">B")
-        log_debug(
-            "OpCode: 0x{0:X} -- {1} (classAnnotation)".format(
-                opid, StreamCodeDebug.op_id(opid)
-            ),
-            ident,
-        )
+        if self._debug:
+            log_debug(
+                "OpCode: 0x{0:X} -- {1} (classAnnotation)".format(
+                    opid, StreamCodeDebug.op_id(opid)
+                ),
+                ident,
+            )
         if opid != TerminalCode.TC_ENDBLOCKDATA:
             raise NotImplementedError("classAnnotation isn't implemented yet")
 
         # superClassDesc
-        log_debug("Reading Super Class of {0}".format(clazz.name), ident)
+        if self._debug:
+            log_debug("Reading Super Class of {0}".format(clazz.name), ident)
         _, superclassdesc = self._read_and_exec_opcode(
             ident=ident + 1,
             expect=(
@@ -397,10 +633,13 @@ class JavaObjectUnmarshaller:
                 TerminalCode.TC_REFERENCE,
             ),
         )
-        log_debug(
-            "Super Class for {0}: {1}".format(clazz.name, str(superclassdesc)),
-            ident,
-        )
+        if self._debug:
+            log_debug(
+                "Super Class for {0}: {1}".format(
+                    clazz.name, str(superclassdesc)
+                ),
+                ident,
+            )
         clazz.superclass = superclassdesc
         return clazz
 
@@ -413,7 +652,8 @@ class JavaObjectUnmarshaller:
         :return: A string containing the block data
         """
         # TC_BLOCKDATA (unsigned byte)<size> (byte)[size]
-        log_debug("[blockdata]", ident)
+        if self._debug:
+            log_debug("[blockdata]", ident)
         (length,) = self._readStruct(">B")
         ba = self.object_stream.read(length)
 
@@ -429,7 +669,8 @@ class JavaObjectUnmarshaller:
         :return: A string containing the block data
         """
         # TC_BLOCKDATALONG (int)<size> (byte)[size]
-        log_debug("[blockdatalong]", ident)
+        if self._debug:
+            log_debug("[blockdatalong]", ident)
         (length,) = self._readStruct(">I")
         ba = self.object_stream.read(length)
 
@@ -445,7 +686,8 @@ class JavaObjectUnmarshaller:
         :return: A JavaClass object
         """
         # TC_CLASS classDesc newHandle
-        log_debug("[class]", ident)
+        if self._debug:
+            log_debug("[class]", ident)
 
         # TODO: what to do with "(ClassDesc)prevObject".
         # (see 3rd line for classDesc:)
@@ -458,7 +700,8 @@ class JavaObjectUnmarshaller:
                 TerminalCode.TC_REFERENCE,
             ),
         )
-        log_debug("Classdesc: {0}".format(classdesc), ident)
+        if self._debug:
+            log_debug("Classdesc: {0}".format(classdesc), ident)
         self._add_reference(classdesc, ident)
         return classdesc
 
@@ -472,13 +715,14 @@ class JavaObjectUnmarshaller:
         """
         # TC_OBJECT classDesc newHandle classdata[]  // data for each class
         java_object = JavaObject()
-        log_debug("[object]", ident)
-        log_debug(
-            "java_object.annotations just after instantiation: {0}".format(
-                java_object.annotations
-            ),
-            ident,
-        )
+        if self._debug:
+            log_debug("[object]", ident)
+            log_debug(
+                "java_object.annotations just after instantiation: {0}".format(
+                    java_object.annotations
+                ),
+                ident,
+            )
 
         # TODO: what to do with "(ClassDesc)prevObject".
         # (see 3rd line for classDesc:)
@@ -518,41 +762,87 @@ class JavaObjectUnmarshaller:
             # TODO: look at ObjectInputStream.readSerialData()
             # FIXME: Handle the SC_WRITE_METHOD flag
 
-            # create megalist
-            tempclass = classdesc
-            megalist = []
-            megatypes = []
-            log_debug("Constructing class...", ident)
-            while tempclass:
-                log_debug("Class: {0}".format(tempclass.name), ident + 1)
-                class_fields_str = " - ".join(
-                    " ".join((str(field_type), field_name))
-                    for field_type, field_name in zip(
-                        tempclass.fields_types, tempclass.fields_names
-                    )
+            # create megalist, once per class
+            all_fields = classdesc._all_fields
+            if all_fields is None or self._debug:
+                tempclass = classdesc
+                hierarchy = []
+                if self._debug:
+                    log_debug("Constructing class...", ident)
+                while tempclass:
+                    if self._debug:
+                        log_debug(
+                            "Class: {0}".format(tempclass.name), ident + 1
+                        )
+                        class_fields_str = " - ".join(
+                            " ".join((str(field_type), field_name))
+                            for field_type, field_name in zip(
+                                tempclass.fields_types, tempclass.fields_names
+                            )
+                        )
+                        if class_fields_str:
+                            log_debug(class_fields_str, ident + 2)
+
+                    hierarchy.append(tempclass)
+                    tempclass = tempclass.superclass
+
+                # Fields of the parent classes come first
+                all_names = []
+                all_types = []
+                for tempclass in reversed(hierarchy):
+                    all_names.extend(tempclass.fields_names)
+                    all_types.extend(tempclass.fields_types)
+
+                # Type codes of the fields, as integers
+                all_codes = [
+                    self._get_type_code(field_type) for field_type in all_types
+                ]
+
+                all_fields = (all_names, all_types, all_codes)
+                classdesc._all_fields = all_fields
+
+            megalist, megatypes, megacodes = all_fields
+
+            if self._debug:
+                log_debug("Values count: {0}".format(len(megalist)), ident)
+                log_debug(
+                    "Prepared list of values: {0}".format(megalist), ident
                 )
-                if class_fields_str:
-                    log_debug(class_fields_str, ident + 2)
-
-                fieldscopy = tempclass.fields_names[:]
-                fieldscopy.extend(megalist)
-                megalist = fieldscopy
-
-                fieldscopy = tempclass.fields_types[:]
-                fieldscopy.extend(megatypes)
-                megatypes = fieldscopy
-
-                tempclass = tempclass.superclass
-
-            log_debug("Values count: {0}".format(len(megalist)), ident)
-            log_debug("Prepared list of values: {0}".format(megalist), ident)
-            log_debug("Prepared list of types: {0}".format(megatypes), ident)
-
-            for field_name, field_type in zip(megalist, megatypes):
                 log_debug(
-                    "Reading field: {0} - {1}".format(field_type, field_name)
+                    "Prepared list of types: {0}".format(megatypes), ident
                 )
-                res = self._read_value(field_type, ident, name=field_name)
+
+            fields_reader = classdesc._fields_reader
+            if fields_reader is None:
+                fields_reader = self._prepare_fields_reader(megacodes)
+                classdesc._fields_reader = fields_reader
+
+            if fields_reader and not self._debug:
+                # Only primitive fields: read them all at once
+                packer, converters = fields_reader
+                values = self._readPacked(packer)
+                if converters is not None:
+                    values = [
+                        value if converter is None else converter(value)
+                        for converter, value in zip(converters, values)
+                    ]
+
+                for field_name, res in zip(megalist, values):
+                    java_object.__setattr__(field_name, res)
+
+                # Skip the field by field reading
+                megalist = megatypes = megacodes = ()
+
+            for field_name, field_type, type_code in zip(
+                megalist, megatypes, megacodes
+            ):
+                if self._debug:
+                    log_debug(
+                        "Reading field: {0} - {1}".format(
+                            field_type, field_name
+                        )
+                    )
+                res = self._read_value(type_code, ident, name=field_name)
                 java_object.__setattr__(field_name, res)
 
         if (
@@ -565,35 +855,60 @@ class JavaObjectUnmarshaller:
             and classdesc.superclass.flags & ClassDescFlags.SC_WRITE_METHOD
         ):
             # objectAnnotation
-            log_debug(
-                "java_object.annotations before: {0}".format(
-                    java_object.annotations
-                ),
-                ident,
-            )
-
-            while opcode != TerminalCode.TC_ENDBLOCKDATA:
-                opcode, obj = self._read_and_exec_opcode(ident=ident + 1)
-                # , expect=[self.TC_ENDBLOCKDATA, self.TC_BLOCKDATA,
-                # self.TC_OBJECT, self.TC_NULL, self.TC_REFERENCE])
-                if opcode != TerminalCode.TC_ENDBLOCKDATA:
-                    java_object.annotations.append(obj)
+            if self._debug:
+                log_debug(
+                    "java_object.annotations before: {0}".format(
+                        java_object.annotations
+                    ),
+                    ident,
+                )
 
-                log_debug("objectAnnotation value: {0}".format(obj), ident)
+            if self._debug:
+                while opcode != TerminalCode.TC_ENDBLOCKDATA:
+                    opcode, obj = self._read_and_exec_opcode(ident=ident + 1)
+                    # , expect=[self.TC_ENDBLOCKDATA, self.TC_BLOCKDATA,
+                    # self.TC_OBJECT, self.TC_NULL, self.TC_REFERENCE])
+                    if opcode != TerminalCode.TC_ENDBLOCKDATA:
+                        java_object.annotations.append(obj)
 
-            log_debug(
-                "java_object.annotations after: {0}".format(
-                    java_object.annotations
-                ),
-                ident,
-            )
+                    log_debug(
+                        "objectAnnotation value: {0}".format(obj), ident
+                    )
+            else:
+                # Same loop, with the opcode dispatch inlined
+                append_annotation = java_object.annotations.append
+                ophandlers = self._ophandlers
+                while True:
+                    (opid,) = self._readPacked(_S_B)
+                    if opid == TerminalCode.TC_ENDBLOCKDATA:
+                        break
+
+                    handler = ophandlers[opid]
+                    if handler is None:
+                        raise RuntimeError(
+                            "Unknown OpCode in the stream: 0x{0:X} "
+                            "(at offset 0x{1:X})".format(
+                                opid, self.object_stream.tell() - 1
+                            )
+                        )
+                    append_annotation(handler(ident=ident + 1))
+
+            if self._debug:
+                log_debug(
+                    "java_object.annotations after: {0}".format(
+                        java_object.annotations
+                    ),
+                    ident,
+                )
 
         # Allow extra loading operations
         if hasattr(java_object, "__extra_loading__"):
-            log_debug("Java object has extra loading capability.")
+            if self._debug:
+                log_debug("Java object has extra loading capability.")
             java_object.__extra_loading__(self, ident)
 
-        log_debug(">>> java_object: {0}".format(java_object), ident)
+        if self._debug:
+            log_debug(">>> java_object: {0}".format(java_object), ident)
         return java_object
 
     def do_string(self, parent=None, ident=0):
@@ -604,7 +919,8 @@ class JavaObjectUnmarshaller:
         :param ident: Log indentation level
         :return: A string
         """
-        log_debug("[string]", ident)
+        if self._debug:
+            log_debug("[string]", ident)
         ba = JavaString(self._readString())
         self._add_reference(ba, ident)
         return ba
@@ -617,7 +933,8 @@ class JavaObjectUnmarshaller:
         :param ident: Log indentation level
         :return: A string
         """
-        log_debug("[long string]", ident)
+        if self._debug:
+            log_debug("[long string]", ident)
         ba = JavaString(self._readString("Q"))
         self._add_reference(ba, ident)
         return ba
@@ -631,7 +948,8 @@ class JavaObjectUnmarshaller:
         :return: A list of deserialized objects
         """
         # TC_ARRAY classDesc newHandle (int)<size> values[size]
-        log_debug("[array]", ident)
+        if self._debug:
+            log_debug("[array]", ident)
         _, classdesc = self._read_and_exec_opcode(
             ident=ident + 1,
             expect=(
@@ -647,30 +965,54 @@ class JavaObjectUnmarshaller:
         self._add_reference(array, ident)
 
         (size,) = self._readStruct(">i")
-        log_debug("size: {0}".format(size), ident)
+        if self._debug:
+            log_debug("size: {0}".format(size), ident)
 
-        array_type_code = TypeCode(ord(classdesc.name[0]))
-        assert array_type_code == TypeCode.TYPE_ARRAY
-        type_code = TypeCode(ord(classdesc.name[1]))
+        type_code = classdesc._array_type_code
+        if type_code is None:
+            array_type_code = TypeCode(ord(classdesc.name[0]))
+            assert array_type_code == TypeCode.TYPE_ARRAY
+            type_code = TypeCode(ord(classdesc.name[1]))
+            classdesc._array_type_code = type_code
 
         if type_code in (TypeCode.TYPE_OBJECT, TypeCode.TYPE_ARRAY):
-            for _ in range(size):
-                _, res = self._read_and_exec_opcode(ident=ident + 1)
-                log_debug("Object value: {0}".format(res), ident)
-                array.append(res)
+            read_value = self._read_value_only
+            if self._debug:
+                for _ in range(size):
+                    res = read_value(ident + 1)
+                    log_debug("Object value: {0}".format(res), ident)
+                    array.append(res)
+            else:
+                array.extend([read_value(ident + 1) for _ in range(size)])
         elif type_code == TypeCode.TYPE_BYTE:
             array = JavaByteArray(self.object_stream.read(size), classdesc)
-        elif self.use_numpy_arrays and numpy is not None:
-            array = numpy.fromfile(
-                self.object_stream,
-                dtype=NUMPY_TYPE_MAP[type_code],
-                count=size,
-            )
         else:
-            for _ in range(size):
-                res = self._read_value(type_code, ident)
-                log_debug("Native value: {0}".format(repr(res)), ident)
-                array.append(res)
+            # Read all the items at once
+            fmt, item_size = ARRAY_FORMAT_MAP[type_code]
+            length = size * item_size
+            ba = self.object_stream.read(length)
+            if len(ba) != length:
+                raise RuntimeError(
+                    "Stream has been ended unexpectedly while unmarshaling."
+                )
+
+            if self.use_numpy_arrays and numpy is not None:
+                # Copy the array to get a writable one
+                return numpy.frombuffer(
+                    ba, dtype=NUMPY_TYPE_MAP[type_code]
+                ).copy()
+
+            values = struct.unpack(">{0}{1}".format(size, fmt), ba)
+            if type_code == TypeCode.TYPE_BOOLEAN:
+                array.extend(bool(value) for value in values)
+            elif type_code == TypeCode.TYPE_CHAR:
+                array.extend(unicode_char(value) for value in values)
+            else:
+                array.extend(values)
+
+            if self._debug:
+                for res in array:
+                    log_debug("Native value: {0}".format(repr(res)), ident)
 
         return array
 
@@ -683,9 +1025,13 @@ class JavaObjectUnmarshaller:
         :return: The referenced object
         """
         (handle,) = self._readStruct(">L")
-        log_debug("## Reference handle: 0x{0:X}".format(handle), ident)
-        ref = self.references[handle - StreamConstants.BASE_REFERENCE_IDX]
-        log_debug("###-> Type: {0} - Value: {1}".format(type(ref), ref), ident)
+        if self._debug:
+            log_debug("## Reference handle: 0x{0:X}".format(handle), ident)
+        ref = self.references[handle - _BASE_REFERENCE_IDX]
+        if self._debug:
+            log_debug(
+                "###-> Type: {0} - Value: {1}".format(type(ref), ref), ident
+            )
         return ref
 
     @staticmethod
@@ -741,49 +1087,77 @@ class JavaObjectUnmarshaller:
         :return: The read value
         :raise RuntimeError: Unknown field type
         """
-        if isinstance(raw_field_type, TypeCode):
+        if isinstance(raw_field_type, int):
+            # Integer or TypeCode: both are valid keys of the readers table
             field_type = raw_field_type
-        elif isinstance(raw_field_type, int):
-            field_type = TypeCode(raw_field_type)
         else:
-            # We don't need details for arrays and objects
-            raw_code = raw_field_type[0]
-            if isinstance(raw_code, int):
-                field_type = TypeCode(raw_code)
-            else:
-                field_type = TypeCode(ord(raw_code))
-
-        if field_type == TypeCode.TYPE_BOOLEAN:
-            (val,) = self._readStruct(">B")
-            res = bool(val)  # type: Any
-        elif field_type == TypeCode.TYPE_BYTE:
-            (res,) = self._readStruct(">b")
-        elif field_type == TypeCode.TYPE_CHAR:
-            # TYPE_CHAR is defined by the serialization specification
-            # but not used in the implementation, so this is
-            # a hypothetical code
-            res = unicode_char(self._readStruct(">H")[0])
-        elif field_type == TypeCode.TYPE_SHORT:
-            (res,) = self._readStruct(">h")
-        elif field_type == TypeCode.TYPE_INTEGER:
-            (res,) = self._readStruct(">i")
-        elif field_type == TypeCode.TYPE_LONG:
-            (res,) = self._readStruct(">q")
-        elif field_type == TypeCode.TYPE_FLOAT:
-            (res,) = self._readStruct(">f")
-        elif field_type == TypeCode.TYPE_DOUBLE:
-            (res,) = self._readStruct(">d")
+            field_type = self._get_type_code(raw_field_type)
+
+        reader = _PRIMITIVE_READERS.get(field_type)
+        if reader is not None:
+            packer, converter = reader
+            (res,) = self._readPacked(packer)
+            if converter is not None:
+                res = converter(res)
         elif field_type in (TypeCode.TYPE_OBJECT, TypeCode.TYPE_ARRAY):
-            _, res = self._read_and_exec_opcode(ident=ident + 1)
+            res = self._read_value_only(ident + 1)
         else:
             raise RuntimeError("Unknown typecode: {0}".format(field_type))
 
-        log_debug(
-            "* {0} {1}: {2}".format(chr(field_type.value), name, repr(res)),
-            ident,
-        )
+        if self._debug:
+            log_debug(
+                "* {0} {1}: {2}".format(chr(field_type), name, repr(res)),
+                ident,
+            )
         return res
 
+    @staticmethod
+    def _prepare_fields_reader(fields_codes):
+        # type: (List[int]) -> Any
+        """
+        Prepares the reader of the fields of an instance, if they are all of
+        a primitive type
+
+        :param fields_codes: Type codes of all the fields of the instance
+        :return: A (struct, conversion methods) tuple, or False if some
+                 fields are objects or arrays
+        """
+        if not fields_codes:
+            return False
+
+        formats = []
+        converters = []
+        for type_code in fields_codes:
+            try:
+                fmt = ARRAY_FORMAT_MAP[type_code][0]
+                converter = _PRIMITIVE_READERS[type_code][1]
+            except KeyError:
+                # Object, array or unknown type: read fields one by one
+                return False
+
+            formats.append(fmt)
+            converters.append(converter)
+
+        if not any(converters):
+            converters = None
+
+        return struct.Struct(">" + "".join(formats)), converters
+
+    @staticmethod
+    def _get_type_code(field_type):
+        # type: (Union[bytes, str]) -> int
+        """
+        Returns the type code of a field type, as an integer
+
+        :param field_type: A field type, as found in a class description
+        :return: The integer value of its first character
+        """
+        # We don't need details for arrays and objects
+        raw_code = field_type[0]
+        if isinstance(raw_code, int):
+            return raw_code
+        return ord(raw_code)
+
     @staticmethod
     def _convert_char_to_type(type_char):
         # type: (Any) -> TypeCode
@@ -799,8 +1173,8 @@ class JavaObjectUnmarshaller:
             typecode = ord(type_char)
 
         try:
-            return TypeCode(typecode)
-        except ValueError:
+            return _TYPE_CODES[typecode]
+        except KeyError:
             raise RuntimeError(
                 "Typecode {0} ({1}) isn't supported.".format(
                     type_char, typecode
@@ -814,15 +1188,16 @@ class JavaObjectUnmarshaller:
         :param obj: Reference to add
         :param ident: Log indentation level
         """
-        log_debug(
-            "## New reference handle 0x{0:X}: {1} -> {2}".format(
-                len(self.references) + StreamConstants.BASE_REFERENCE_IDX,
-                type(obj).__name__,
-                repr(obj),
-            ),
-            ident,
-        )
-        self.references.append(obj)
+        if self._debug:
+            log_debug(
+                "## New reference handle 0x{0:X}: {1} -> {2}".format(
+                    len(self.references) + StreamConstants.BASE_REFERENCE_IDX,
+                    type(obj).__name__,
+                    repr(obj),
+                ),
+                ident,
+            )
+        self._ref_append(obj)
 
     def _oops_dump_state(self, ignore_remaining_data=False):
         """
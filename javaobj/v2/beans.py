@@ -28,11 +28,11 @@ from __future__ import absolute_import
 
 import logging
 from enum import IntEnum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ..constants import ClassDescFlags, TypeCode
 from ..modifiedutf8 import byte_to_int, decode_modified_utf8
-from ..utils import UNICODE_TYPE
+from ..utils import UNICODE_TYPE, intern_str
 
 # ------------------------------------------------------------------------------
 
@@ -43,6 +43,17 @@ __version__ = ".".join(str(x) for x in __version_info__)
 # Documentation strings format
 __docformat__ = "restructuredtext en"
 
+# Flags of classes which can be read
+_SERIAL_OR_EXTERN = (
+    ClassDescFlags.SC_SERIALIZABLE | ClassDescFlags.SC_EXTERNALIZABLE
+)
+
+# Maximum number of entries in a strings cache
+_STRINGS_CACHE_SIZE = 4096
+
+# Strings longer than this (in bytes) are decoded without being cached
+_STRINGS_CACHE_MAX_LENGTH = 256
+
 # ------------------------------------------------------------------------------
 
 
@@ -110,6 +121,11 @@ class ParsedJavaContent(object):  # pylint:disable=R205
     Generic representation of data parsed from the stream
     """
 
+    # The members of this class are declared in the slots of the subclasses,
+    # as built-in types (list, dict, ...) can't be mixed with non-empty slots.
+    # Those slots include __dict__ (created on demand), to allow custom members
+    __slots__ = ()
+
     def __init__(self, content_type):
         # type: (ContentType) -> None
         self.type = content_type  # type: ContentType
@@ -140,6 +156,15 @@ class ExceptionState(ParsedJavaContent):
     Representation of a failed parsing
     """
 
+    __slots__ = (
+        "type",
+        "is_exception",
+        "handle",
+        "exception_object",
+        "stream_data",
+        "__dict__",
+    )
+
     def __init__(self, exception_object, data):
         # type: (ParsedJavaContent, bytes) -> None
         super(ExceptionState, self).__init__(ContentType.EXCEPTIONSTATE)
@@ -170,13 +195,43 @@ class JavaString(ParsedJavaContent):
     Represents a Java string
     """
 
-    def __init__(self, handle, data):
-        # type: (int, bytes) -> None
+    __slots__ = (
+        "type",
+        "is_exception",
+        "handle",
+        "value",
+        "length",
+        "_hash",
+        "__dict__",
+    )
+
+    def __init__(self, handle, data, strings_cache=None):
+        # type: (int, bytes, Optional[Dict[bytes, Tuple[str, int]]]) -> None
+        """
+        :param handle: Handle of the string
+        :param data: Modified UTF-8 representation of the string
+        :param strings_cache: Raw bytes -> (value, length) dictionary of the
+                              short strings already decoded, filled by this
+                              method
+        """
         super(JavaString, self).__init__(ContentType.STRING)
         self.handle = handle
-        value, length = decode_modified_utf8(data)
+        if strings_cache is None or len(data) > _STRINGS_CACHE_MAX_LENGTH:
+            # Payload data: don't keep it in the interned strings
+            value, length = decode_modified_utf8(data)
+        else:
+            # Class names and alike are repeated across the stream
+            try:
+                value, length = strings_cache[data]
+            except KeyError:
+                value, length = decode_modified_utf8(data)
+                value = intern_str(value)
+                if len(strings_cache) < _STRINGS_CACHE_SIZE:
+                    strings_cache[data] = (value, length)
+
         self.value = value  # type: str
         self.length = length  # type: int
+        self._hash = hash(value)  # type: int
 
     def __repr__(self):
         return repr(self.value)
@@ -194,7 +249,7 @@ class JavaString(ParsedJavaContent):
         )
 
     def __hash__(self):
-        return hash(self.value)
+        return self._hash
 
     def __eq__(self, other):
         return self.value == other
@@ -205,6 +260,14 @@ class JavaField:
     Represents a field in a Java class description
     """
 
+    __slots__ = (
+        "type",
+        "name",
+        "class_name",
+        "is_inner_class_reference",
+        "__dict__",
+    )
+
     def __init__(self, field_type, name, class_name=None):
         # type: (FieldType, str, Optional[JavaString]) -> None
         self.type = field_type
@@ -235,6 +298,30 @@ class JavaClassDesc(ParsedJavaContent):
     Represents the description of a class
     """
 
+    __slots__ = (
+        "type",
+        "is_exception",
+        "handle",
+        "class_type",
+        "name",
+        "serial_version_uid",
+        "desc_flags",
+        "fields",
+        "inner_classes",
+        "annotations",
+        "super_class",
+        "is_super_class",
+        "interfaces",
+        "enum_constants",
+        "is_inner_class",
+        "is_local_inner_class",
+        "is_static_member_class",
+        "_data_type",
+        "_fields_layout",
+        "_hierarchy",
+        "__dict__",
+    )
+
     def __init__(self, class_desc_type):
         # type: (ClassDescType) -> None
         super(JavaClassDesc, self).__init__(ContentType.CLASSDESC)
@@ -281,6 +368,15 @@ class JavaClassDesc(ParsedJavaContent):
         # Flag to indicate if this is a static member class
         self.is_static_member_class = False  # type: bool
 
+        # Computed data type: (flags, data type)
+        self._data_type = None  # type: Optional[Tuple[int, ClassDataType]]
+
+        # Computed fields names and types (see _get_fields_layout)
+        self._fields_layout = None  # type: Optional[Tuple[Any, ...]]
+
+        # Computed class hierarchy: (super class, hierarchy)
+        self._hierarchy = None  # type: Optional[Tuple[Any, Tuple[Any, ...]]]
+
     def __str__(self):
         return "[classdesc 0x{0:x}: name {1}, uid {2}]".format(
             self.handle, self.name, self.serial_version_uid
@@ -311,40 +407,72 @@ class JavaClassDesc(ParsedJavaContent):
         """
         return self.desc_flags
 
+    def _get_fields_layout(self):
+        # type: () -> Tuple[Any, ...]
+        """
+        Returns the names and types of the fields of this class, computed
+        once as long as the list of fields isn't changed
+
+        :return: A (fields, fields count, names, types) tuple
+        """
+        fields = self.fields
+        layout = self._fields_layout
+        if (
+            layout is None
+            or layout[0] is not fields
+            or layout[1] != len(fields)
+        ):
+            layout = (
+                fields,
+                len(fields),
+                tuple(field.name for field in fields),
+                tuple(field.type for field in fields),
+            )
+            self._fields_layout = layout
+
+        return layout
+
     @property
     def fields_names(self):
         """
         Mimics the javaobj API
         """
-        return [field.name for field in self.fields]
+        return list(self._get_fields_layout()[2])
 
     @property
     def fields_types(self):
         """
         Mimics the javaobj API
         """
-        return [field.type for field in self.fields]
+        return list(self._get_fields_layout()[3])
 
     @property
     def data_type(self):
         """
         Computes the data type of this class (Write, No Write, Annotation)
         """
-        if ClassDescFlags.SC_SERIALIZABLE & self.desc_flags:
-            return (
+        desc_flags = self.desc_flags
+        cached = self._data_type
+        if cached is not None and cached[0] == desc_flags:
+            return cached[1]
+
+        if ClassDescFlags.SC_SERIALIZABLE & desc_flags:
+            data_type = (
                 ClassDataType.WRCLASS
-                if (ClassDescFlags.SC_WRITE_METHOD & self.desc_flags)
+                if (ClassDescFlags.SC_WRITE_METHOD & desc_flags)
                 else ClassDataType.NOWRCLASS
             )
-
-        if ClassDescFlags.SC_EXTERNALIZABLE & self.desc_flags:
-            return (
+        elif ClassDescFlags.SC_EXTERNALIZABLE & desc_flags:
+            data_type = (
                 ClassDataType.OBJECT_ANNOTATION
-                if (ClassDescFlags.SC_WRITE_METHOD & self.desc_flags)
+                if (ClassDescFlags.SC_WRITE_METHOD & desc_flags)
                 else ClassDataType.EXTERNAL_CONTENTS
             )
+        else:
+            raise ValueError("Unhandled Class Data Type")
 
-        raise ValueError("Unhandled Class Data Type")
+        self._data_type = (desc_flags, data_type)
+        return data_type
 
     def is_array_class(self):
         # type: () -> bool
@@ -362,21 +490,34 @@ class JavaClassDesc(ParsedJavaContent):
 
         :param classes: A list to be filled in with the hierarchy
         """
-        if self.super_class is not None:
-            if self.super_class.class_type == ClassDescType.PROXYCLASS:
-                logging.warning("Hit a proxy class in super class hierarchy")
-            else:
-                self.super_class.get_hierarchy(classes)
+        hierarchy = self._hierarchy
+        if hierarchy is None or hierarchy[0] is not self.super_class:
+            # Walk up the super classes
+            chain = []  # type: List[JavaClassDesc]
+            node = self  # type: Optional[JavaClassDesc]
+            while node is not None:
+                chain.append(node)
+                node = node.super_class
+                if (
+                    node is not None
+                    and node.class_type == ClassDescType.PROXYCLASS
+                ):
+                    logging.warning(
+                        "Hit a proxy class in super class hierarchy"
+                    )
+                    break
 
-        classes.append(self)
+            chain.reverse()
+            hierarchy = (self.super_class, tuple(chain))
+            self._hierarchy = hierarchy
+
+        classes.extend(hierarchy[1])
 
     def validate(self):
         """
         Checks the validity of this class description
         """
-        serial_or_extern = (
-            ClassDescFlags.SC_SERIALIZABLE | ClassDescFlags.SC_EXTERNALIZABLE
-        )
+        serial_or_extern = _SERIAL_OR_EXTERN
         if (self.desc_flags & serial_or_extern) == 0 and self.fields:
             raise ValueError(
                 "Non-serializable, non-externalizable class has fields"
@@ -403,10 +544,21 @@ class JavaInstance(ParsedJavaContent):
     Represents an instance of Java object
     """
 
+    # Field name -> value index, and the field values it has been built from.
+    # Class attributes, to avoid a recursion in __getattr__
+    _name_index = None  # type: Dict[str, Any]
+    _name_index_source = None  # type: List[Tuple[JavaClassDesc, List[Any]]]
+
+    # Values of the fields as set by the parser: a list of values aligned to
+    # the fields of each class of the hierarchy, and the equivalent
+    # dictionary, built on first access to field_data
+    _field_values = None  # type: List[Tuple[JavaClassDesc, List[Any]]]
+    _field_data = None  # type: Dict[JavaClassDesc, Dict[JavaField, Any]]
+
     def __init__(self):
         super(JavaInstance, self).__init__(ContentType.INSTANCE)
         self.classdesc = None  # type: JavaClassDesc
-        self.field_data = {}  # type: Dict[JavaClassDesc, Dict[JavaField, Any]]
+        self._field_data = {}
         self.annotations = (
             {}
         )  # type: Dict[JavaClassDesc, List[ParsedJavaContent]]
@@ -419,6 +571,61 @@ class JavaInstance(ParsedJavaContent):
 
     __repr__ = __str__
 
+    @property
+    def field_data(self):
+        # type: () -> Dict[JavaClassDesc, Dict[JavaField, Any]]
+        """
+        Values of the fields of the instance, per class of its hierarchy
+        """
+        if self._field_data is None:
+            # Convert the values read by the parser: from now on, this
+            # dictionary holds the values of the fields
+            self._field_data = {
+                cd: dict(zip(cd.fields, values))
+                for cd, values in self._field_values or ()
+            }
+            self._field_values = None
+            self._name_index = self._name_index_source = None
+
+        return self._field_data
+
+    @field_data.setter
+    def field_data(self, field_data):
+        # type: (Dict[JavaClassDesc, Dict[JavaField, Any]]) -> None
+        """
+        Sets the values of the fields of the instance
+        """
+        self._field_data = field_data
+        self._field_values = None
+
+    def _set_field_values(self, field_values):
+        # type: (List[Tuple[JavaClassDesc, List[Any]]]) -> None
+        """
+        Sets the values of the fields, as read by the parser
+
+        :param field_values: A list of (class, values) tuples, where the
+                             values are in the order of the class fields
+        """
+        self._field_values = field_values
+        self._field_data = None
+
+    def _iter_field_items(self):
+        # type: () -> List[Tuple[JavaClassDesc, List[Tuple[JavaField, Any]]]]
+        """
+        Lists the (field, value) pairs of each class of the hierarchy,
+        without building the field_data dictionary
+        """
+        if self._field_values is not None:
+            return [
+                (cd, list(zip(cd.fields, values)))
+                for cd, values in self._field_values
+            ]
+
+        return [
+            (cd, list(fields.items()))
+            for cd, fields in self.field_data.items()
+        ]
+
     def dump(self, indent=0):
         # type: (int) -> str
         """
@@ -443,11 +650,11 @@ class JavaInstance(ParsedJavaContent):
             for ann in annotations:
                 dump.append(sub_prefix + repr(ann))
 
-        for cd, fields in self.field_data.items():
+        for cd, fields in self._iter_field_items():
             dump.append(
                 "{0}{1} -- {2} fields".format(prefix, cd.name, len(fields))
             )
-            for field, value in fields.items():
+            for field, value in fields:
                 if isinstance(value, ParsedJavaContent):
                     if self.handle != 0 and value.handle == self.handle:
                         value_str = "this"
@@ -469,12 +676,32 @@ class JavaInstance(ParsedJavaContent):
         """
         Returns the field with the given name
         """
-        for cd_fields in self.field_data.values():
-            for field, value in cd_fields.items():
-                if field.name == name:
-                    return value
-
-        raise AttributeError(name)
+        field_values = self._field_values
+        if field_values is None:
+            # The field data dictionary has been handed out and might have
+            # been modified: look for the field in it
+            for cd_fields in self.field_data.values():
+                for field, value in cd_fields.items():
+                    if field.name == name:
+                        return value
+
+            raise AttributeError(name)
+
+        if self._name_index_source is not field_values:
+            # (Re)build the index when the parser has set the field values
+            name_index = {}  # type: Dict[str, Any]
+            for cd, values in field_values:
+                for field, value in zip(cd.fields, values):
+                    # Keep the first field with this name
+                    name_index.setdefault(field.name, value)
+
+            self._name_index = name_index
+            self._name_index_source = field_values
+
+        try:
+            return self._name_index[name]
+        except KeyError:
+            raise AttributeError(name)
 
     def get_class(self):
         """
@@ -517,6 +744,8 @@ class JavaClass(ParsedJavaContent):
     Represents a stored Java class
     """
 
+    __slots__ = ("type", "is_exception", "handle", "classdesc", "__dict__")
+
     def __init__(self, handle, class_desc):
         # type: (int, JavaClassDesc) -> None
         super(JavaClass, self).__init__(ContentType.CLASS)
@@ -541,6 +770,15 @@ class JavaEnum(ParsedJavaContent):
     Represents an enumeration value
     """
 
+    __slots__ = (
+        "type",
+        "is_exception",
+        "handle",
+        "classdesc",
+        "value",
+        "__dict__",
+    )
+
     def __init__(self, handle, class_desc, value):
         # type: (int, JavaClassDesc, JavaString) -> None
         super(JavaEnum, self).__init__(ContentType.ENUM)
@@ -616,6 +854,8 @@ class BlockData(ParsedJavaContent):
     Represents a data block
     """
 
+    __slots__ = ("type", "is_exception", "handle", "data", "__dict__")
+
     def __init__(self, data):
         # type: (bytes) -> None
         super(BlockData, self).__init__(ContentType.BLOCKDATA)
@@ -29,6 +29,7 @@ from __future__ import absolute_import
 
 import logging
 import os
+import struct
 from typing import (  # pylint:disable=W0611
     IO,
     Any,
@@ -36,6 +37,7 @@ from typing import (  # pylint:disable=W0611
     Dict,
     List,
     Optional,
+    Tuple,
 )
 
 from ..constants import (
@@ -47,12 +49,12 @@ from ..constants import (
 from ..modifiedutf8 import (  # pylint:disable=W0611  # noqa: F401
     decode_modified_utf8,
 )
+from ..utils import unicode_char
 from . import api  # pylint:disable=W0611
 from .beans import (
     BlockData,
     ClassDataType,
     ClassDescType,
-    ExceptionRead,
     ExceptionState,
     FieldType,
     JavaArray,
@@ -78,17 +80,50 @@ __docformat__ = "restructuredtext en"
 
 # ------------------------------------------------------------------------------
 
+# Struct format of each primitive field type
+PRIMITIVE_FIELD_FORMATS = {
+    FieldType.BYTE: "b",
+    FieldType.CHAR: "H",
+    FieldType.DOUBLE: "d",
+    FieldType.FLOAT: "f",
+    FieldType.INTEGER: "i",
+    FieldType.LONG: "q",
+    FieldType.SHORT: "h",
+    FieldType.BOOLEAN: "B",
+}
+
+# Conversion of the unpacked value of some primitive field types
+PRIMITIVE_FIELD_CONVERTERS = {
+    FieldType.CHAR: unicode_char,
+    FieldType.BOOLEAN: bool,
+}  # type: Dict[FieldType, Callable[[int], Any]]
+
+
+def _compile_fields_struct(fields):
+    # type: (List[JavaField]) -> struct.Struct
+    """
+    Compiles the struct reading the given primitive fields at once
+    """
+    return struct.Struct(
+        ">" + "".join(PRIMITIVE_FIELD_FORMATS[field.type] for field in fields)
+    )
+
+
+# ------------------------------------------------------------------------------
+
 
 class JavaStreamParser(api.IJavaStreamParser):
     """
     Parses a Java stream
     """
 
-    def __init__(self, fd, transformers):
-        # type: (IO[bytes], List[api.ObjectTransformer]) -> None
+    def __init__(self, fd, transformers, keep_handle_maps=False):
+        # type: (IO[bytes], List[api.ObjectTransformer], bool) -> None
         """
         :param fd: File-object to read from
         :param transformers: Custom object transformers
+        :param keep_handle_maps: If True, keep a copy of the handles map
+                                 each time it is reset (for debugging)
         """
         # Input stream
         self.__fd = fd
@@ -101,12 +136,38 @@ class JavaStreamParser(api.IJavaStreamParser):
         self._log = logging.getLogger("javaobj.parser")
 
         # Handles
-        self.__handle_maps = []  # type: List[Dict[int, ParsedJavaContent]]
+        self.__handle_maps = (
+            [] if keep_handle_maps else None
+        )  # type: Optional[List[Dict[int, ParsedJavaContent]]]
         self.__handles = {}  # type: Dict[int, ParsedJavaContent]
 
         # Initial handle value
         self.__current_handle = StreamConstants.BASE_REFERENCE_IDX.value
 
+        # Exception object being propagated up to the enclosing content
+        self.__pending_exception = None  # type: Optional[ParsedJavaContent]
+
+        # Class description -> reader of the content of its instances
+        self.__instance_readers = (
+            {}
+        )  # type: Dict[JavaClassDesc, Callable[[JavaStreamParser, JavaInstance], None]]
+
+        # Raw bytes -> (value, length) of the short strings of the stream
+        self.__strings_cache = {}  # type: Dict[bytes, Tuple[str, int]]
+
+        # Readers of primitive field values
+        reader = self.__reader
+        self.__field_readers = {
+            FieldType.BYTE: reader.read_byte,
+            FieldType.CHAR: reader.read_char,
+            FieldType.DOUBLE: reader.read_double,
+            FieldType.FLOAT: reader.read_float,
+            FieldType.INTEGER: reader.read_int,
+            FieldType.LONG: reader.read_long,
+            FieldType.SHORT: reader.read_short,
+            FieldType.BOOLEAN: reader.read_bool,
+        }  # type: Dict[FieldType, Callable[[], Any]]
+
         # Definition of the type code handlers
         # Each takes the type code as argument
         self.__type_code_handlers = {
@@ -145,11 +206,17 @@ class JavaStreamParser(api.IJavaStreamParser):
 
         # Read content
         contents = []  # type: List[ParsedJavaContent]
+        fd = self.__fd
+        tell = fd.tell
+        read_byte = self.__reader.read_byte
+        log_info = self._log.isEnabledFor(logging.INFO)
+        log_debug = self._log.isEnabledFor(logging.DEBUG)
         while True:
-            self._log.info("Reading next content")
-            start = self.__fd.tell()
+            if log_info:
+                self._log.info("Reading next content")
+            start = tell()
             try:
-                type_code = self.__reader.read_byte()
+                type_code = read_byte()
             except EOFError:
                 # End of file
                 break
@@ -160,25 +227,23 @@ class JavaStreamParser(api.IJavaStreamParser):
                 continue
 
             parsed_content = self._read_content(type_code, True)
-            self._log.debug("Read: %s", parsed_content)
+            if log_debug:
+                self._log.debug("Read: %s", parsed_content)
             if parsed_content is not None and parsed_content.is_exception:
                 # Get the raw data between the start of the object and our
                 # current position
-                end = self.__fd.tell()
-                self.__fd.seek(start, os.SEEK_SET)
-                stream_data = self.__fd.read(end - start)
+                end = tell()
+                fd.seek(start)
+                stream_data = fd.read(end - start)
 
                 # Prepare an exception object
                 parsed_content = ExceptionState(parsed_content, stream_data)
 
             contents.append(parsed_content)
 
-        for content in self.__handles.values():
-            content.validate()
-
         # TODO: connect member classes ? (see jdeserialize @ 864)
 
-        if self.__handles:
+        if self.__handle_maps is not None and self.__handles:
             self.__handle_maps.append(self.__handles.copy())
 
         return contents
@@ -252,7 +317,7 @@ class JavaStreamParser(api.IJavaStreamParser):
         """
         Resets the internal state of the parser
         """
-        if self.__handles:
+        if self.__handle_maps is not None and self.__handles:
             self.__handle_maps.append(self.__handles.copy())
 
         self.__handles.clear()
@@ -297,10 +362,9 @@ class JavaStreamParser(api.IJavaStreamParser):
         ):
             raise ValueError("Got a block data, but not allowed here.")
 
-        try:
-            # Look for a handler for that type code
-            handler = self.__type_code_handlers[type_code]
-        except KeyError:
+        # Look for a handler for that type code
+        handler = self.__type_code_handlers.get(type_code)
+        if handler is None:
             # Look for an external reader
             if (
                 class_desc
@@ -312,13 +376,31 @@ class JavaStreamParser(api.IJavaStreamParser):
 
             # No valid custom reader: abandon
             raise ValueError("Unknown type code: 0x{0:x}".format(type_code))
-        else:
-            try:
-                # Parse the object
-                return handler(type_code)
-            except ExceptionRead as ex:
-                # We found an exception object: return it (raise later)
-                return ex.exception_object
+
+        # Parse the object
+        content = handler(type_code)
+        if self.__pending_exception is not None:
+            # We found an exception object: return it (raise later)
+            content = self.__pending_exception
+            self.__pending_exception = None
+
+        return content
+
+    def _propagate_exception(self, content):
+        # type: (Optional[ParsedJavaContent]) -> bool
+        """
+        Checks if the given content is an exception object. If so, it will be
+        returned by the enclosing call to ``_read_content()`` and the caller
+        must stop its parsing.
+
+        :param content: A parsed content
+        :return: True if the caller must stop parsing
+        """
+        if content is not None and content.is_exception:
+            self.__pending_exception = content
+            return True
+
+        return self.__pending_exception is not None
 
     def _read_new_string(self, type_code):
         # type: (int) -> JavaString
@@ -348,7 +430,7 @@ class JavaStreamParser(api.IJavaStreamParser):
 
         # Parse the content
         data = self.__fd.read(length)
-        java_str = JavaString(handle, data)
+        java_str = JavaString(handle, data, self.__strings_cache)
 
         # Store the reference to the string
         self._set_handle(handle, java_str)
@@ -405,11 +487,22 @@ class JavaStreamParser(api.IJavaStreamParser):
             class_desc.desc_flags = desc_flags
             class_desc.fields = fields
             class_desc.annotations = self._read_class_annotations(class_desc)
+            if self.__pending_exception is not None:
+                return None
+
             class_desc.super_class = self._read_classdesc()
+            if self.__pending_exception is not None:
+                return None
 
             if class_desc.super_class:
                 class_desc.super_class.is_super_class = True
 
+            # The description is complete: check it now
+            class_desc.validate()
+
+            # Prepare the reader of its instances
+            self._prepare_class_reader(class_desc)
+
             # Store the reference to the parsed bean
             self._set_handle(handle, class_desc)
             return class_desc
@@ -436,11 +529,22 @@ class JavaStreamParser(api.IJavaStreamParser):
             class_desc.handle = handle
             class_desc.interfaces = interfaces
             class_desc.annotations = self._read_class_annotations()
+            if self.__pending_exception is not None:
+                return None
+
             class_desc.super_class = self._read_classdesc()
+            if self.__pending_exception is not None:
+                return None
 
             if class_desc.super_class:
                 class_desc.super_class.is_super_class = True
 
+            # The description is complete: check it now
+            class_desc.validate()
+
+            # Prepare the reader of its instances
+            self._prepare_class_reader(class_desc)
+
             # Store the reference to the parsed bean
             self._set_handle(handle, class_desc)
             return class_desc
@@ -483,10 +587,9 @@ class JavaStreamParser(api.IJavaStreamParser):
                 continue
 
             java_object = self._read_content(type_code, True, class_desc)
-
-            if java_object is not None and java_object.is_exception:
-                # Found an exception: raise it
-                raise ExceptionRead(java_object)
+            if self._propagate_exception(java_object):
+                # Found an exception: stop here
+                return contents
 
             contents.append(java_object)
 
@@ -516,6 +619,8 @@ class JavaStreamParser(api.IJavaStreamParser):
         """
         # Parse the object class description
         class_desc = self._read_classdesc()
+        if self.__pending_exception is not None:
+            return None
 
         # Assign a new handle
         handle = self._new_handle()
@@ -533,6 +638,7 @@ class JavaStreamParser(api.IJavaStreamParser):
 
         # Read the instance content
         self._read_class_data(instance)
+        instance.validate()
         self._log.debug("Done reading object handle %x", handle)
         return instance
 
@@ -556,71 +662,202 @@ class JavaStreamParser(api.IJavaStreamParser):
         """
         Reads the content of an instance
         """
+        class_desc = instance.classdesc
+        try:
+            read_instance = self.__instance_readers[class_desc]
+        except KeyError:
+            read_instance = self._prepare_class_reader(class_desc)
+
+        read_instance(self, instance)
+
+    def _prepare_class_reader(self, class_desc):
+        # type: (JavaClassDesc) -> Callable[[JavaStreamParser, JavaInstance], None]
+        """
+        Prepares the method reading the content of the instances of the given
+        class.
+
+        The class hierarchy, the data type of each class and the layout of
+        their fields are resolved once here instead of once per instance.
+        """
         # Read the class hierarchy
         classes = []  # type: List[JavaClassDesc]
-        instance.classdesc.get_hierarchy(classes)
+        class_desc.get_hierarchy(classes)
+        class_readers = [
+            self._prepare_class_level_reader(cd) for cd in classes
+        ]
+
+        def read_instance(parser, instance):
+            # type: (JavaStreamParser, JavaInstance) -> None
+            """
+            Reads the content of an instance of the prepared class
+            """
+            # Field values, aligned to the fields of each class
+            all_data = []  # type: List[Tuple[JavaClassDesc, List[Any]]]
+            annotations = (
+                {}
+            )  # type: Dict[JavaClassDesc, List[ParsedJavaContent]]
+
+            for class_reader in class_readers:
+                class_reader(parser, instance, all_data, annotations)
+                if parser.__pending_exception is not None:
+                    # Stop reading the instance
+                    return
+
+            # Fill the instance object
+            instance.annotations = annotations
+            instance._set_field_values(all_data)
+
+            # Load transformation from the fields and annotations
+            instance.load_from_instance()
+
+        self.__instance_readers[class_desc] = read_instance
+        return read_instance
+
+    def _prepare_class_level_reader(self, cd):
+        # type: (JavaClassDesc) -> Callable[..., None]
+        """
+        Prepares the method reading the data of a single class of an instance
+        hierarchy
+        """
+        try:
+            data_type = cd.data_type
+        except ValueError:
+            # Raise the error only if an instance of this class is read
 
-        all_data = {}  # type: Dict[JavaClassDesc, Dict[JavaField, Any]]
-        annotations = {}  # type: Dict[JavaClassDesc, List[ParsedJavaContent]]
+            def read_invalid(parser, instance, all_data, annotations):
+                # Raises the validation or data type error
+                cd.validate()
+                return cd.data_type
 
-        for cd in classes:
-            values = {}  # type: Dict[JavaField, Any]
-            cd.validate()
-            if (
-                cd.data_type == ClassDataType.NOWRCLASS
-                or cd.data_type == ClassDataType.WRCLASS
+            return read_invalid
+
+        if data_type == ClassDataType.NOWRCLASS:
+            read_values = self._prepare_fields_reader(cd.fields)
+
+            def read_nowrclass(parser, instance, all_data, annotations):
+                all_data.append((cd, read_values(parser)))
+
+            return read_nowrclass
+
+        if data_type == ClassDataType.WRCLASS:
+            read_values = self._prepare_fields_reader(cd.fields)
+
+            def read_wrclass(parser, instance, all_data, annotations):
+                if not instance.is_external_instance:
+                    all_data.append((cd, read_values(parser)))
+                    if parser.__pending_exception is not None:
+                        return
+
+                annotations[cd] = parser._read_class_annotations(cd)
+
+            return read_wrclass
+
+        if data_type == ClassDataType.OBJECT_ANNOTATION:
+
+            def read_object_annotation(
+                parser, instance, all_data, annotations
             ):
-                if (
-                    cd.data_type == ClassDataType.WRCLASS
-                    and instance.is_external_instance
-                ):
-                    annotations[cd] = self._read_class_annotations(cd)
-                else:
-                    for field in cd.fields:
-                        values[field] = self._read_field_value(field.type)
-                    all_data[cd] = values
+                # Call the transformer if possible
+                if not instance.load_from_blockdata(parser, parser.__reader):
+                    # Can't read :/
+                    raise ValueError(
+                        "hit externalizable with nonzero SC_BLOCK_DATA; "
+                        "can't interpret data"
+                    )
+                annotations[cd] = parser._read_class_annotations(cd)
+
+            return read_object_annotation
+
+        def read_external_contents(parser, instance, all_data, annotations):
+            annotations[cd] = parser._read_class_annotations(cd)
+
+        return read_external_contents
 
-                    if cd.data_type == ClassDataType.WRCLASS:
-                        annotations[cd] = self._read_class_annotations(cd)
+    @staticmethod
+    def _prepare_fields_reader(fields):
+        # type: (List[JavaField]) -> Callable[[JavaStreamParser], List[Any]]
+        """
+        Prepares the method reading the values of the given fields.
+        The values are returned in the order of the fields.
+
+        Consecutive primitive fields are read with a single pre-compiled
+        struct.
+        """
+        # List of (struct or None, fields)
+        groups = []  # type: List[Tuple[Optional[struct.Struct], List[JavaField]]]
+        run = []  # type: List[JavaField]
+        for field in fields:
+            if field.type in PRIMITIVE_FIELD_FORMATS:
+                run.append(field)
             else:
-                if cd.data_type == ClassDataType.OBJECT_ANNOTATION:
-                    # Call the transformer if possible
-                    if not instance.load_from_blockdata(self, self.__reader):
-                        # Can't read :/
-                        raise ValueError(
-                            "hit externalizable with nonzero SC_BLOCK_DATA; "
-                            "can't interpret data"
-                        )
-                annotations[cd] = self._read_class_annotations(cd)
-
-        # Fill the instance object
-        instance.annotations = annotations
-        instance.field_data = all_data
-
-        # Load transformation from the fields and annotations
-        instance.load_from_instance()
+                if run:
+                    groups.append((_compile_fields_struct(run), run))
+                    run = []
+                groups.append((None, [field]))
+
+        if run:
+            groups.append((_compile_fields_struct(run), run))
+
+        # Values needing a conversion after unpacking
+        converters = [
+            (idx, PRIMITIVE_FIELD_CONVERTERS[field.type])
+            for idx, field in enumerate(fields)
+            if field.type in PRIMITIVE_FIELD_CONVERTERS
+        ]
+
+        if not groups:
+
+            def read_no_values(parser):
+                # type: (JavaStreamParser) -> List[Any]
+                """
+                Class without serializable fields
+                """
+                return []
+
+            return read_no_values
+
+        if len(groups) == 1 and groups[0][0] is not None and not converters:
+            single_struct = groups[0][0]
+
+            def read_primitive_values(parser):
+                # type: (JavaStreamParser) -> List[Any]
+                """
+                Reads the values of numeric-only fields in a single call
+                """
+                return list(parser.__reader.read_struct(single_struct))
+
+            return read_primitive_values
+
+        def read_values(parser):
+            # type: (JavaStreamParser) -> List[Any]
+            """
+            Reads the values of the prepared fields
+            """
+            values = []  # type: List[Any]
+            for compiled_struct, group in groups:
+                if compiled_struct is not None:
+                    values.extend(parser.__reader.read_struct(compiled_struct))
+                else:
+                    values.append(parser._read_field_value(group[0].type))
+                    if parser.__pending_exception is not None:
+                        # Stop reading fields
+                        return []
+
+            for idx, converter in converters:
+                values[idx] = converter(values[idx])
+
+            return values
+
+        return read_values
 
     def _read_field_value(self, field_type):
         # type: (FieldType) -> Any
         """
         Reads the value of an instance field
         """
-        if field_type == FieldType.BYTE:
-            return self.__reader.read_byte()
-        if field_type == FieldType.CHAR:
-            return self.__reader.read_char()
-        if field_type == FieldType.DOUBLE:
-            return self.__reader.read_double()
-        if field_type == FieldType.FLOAT:
-            return self.__reader.read_float()
-        if field_type == FieldType.INTEGER:
-            return self.__reader.read_int()
-        if field_type == FieldType.LONG:
-            return self.__reader.read_long()
-        if field_type == FieldType.SHORT:
-            return self.__reader.read_short()
-        if field_type == FieldType.BOOLEAN:
-            return self.__reader.read_bool()
+        reader = self.__field_readers.get(field_type)
+        if reader is not None:
+            return reader()
         if field_type in (FieldType.OBJECT, FieldType.ARRAY):
             sub_type_code = self.__reader.read_byte()
             if field_type == FieldType.ARRAY:
@@ -635,9 +872,7 @@ class JavaStreamParser(api.IJavaStreamParser):
                     )
 
             content = self._read_content(sub_type_code, False)
-            if content is not None and content.is_exception:
-                raise ExceptionRead(content)
-
+            self._propagate_exception(content)
             return content
 
         raise ValueError("Can't process type: {0}".format(field_type))
@@ -659,6 +894,9 @@ class JavaStreamParser(api.IJavaStreamParser):
         Parses an enumeration
         """
         cd = self._read_classdesc()
+        if self.__pending_exception is not None:
+            return None
+
         if cd is None:
             raise ValueError("Enum description can't be null")
 
@@ -668,6 +906,7 @@ class JavaStreamParser(api.IJavaStreamParser):
         sub_type_code = self.__reader.read_byte()
         enum_str = self._read_new_string(sub_type_code)
         cd.enum_constants.add(enum_str.value)
+        cd.validate()
 
         # Store the object
         enum_obj = JavaEnum(handle, cd, enum_str)
@@ -680,6 +919,9 @@ class JavaStreamParser(api.IJavaStreamParser):
         Parses a class
         """
         cd = self._read_classdesc()
+        if self.__pending_exception is not None:
+            return None
+
         handle = self._new_handle()
         class_obj = JavaClass(handle, cd)
 
@@ -693,6 +935,9 @@ class JavaStreamParser(api.IJavaStreamParser):
         Parses an array
         """
         cd = self._read_classdesc()
+        if self.__pending_exception is not None:
+            return None
+
         handle = self._new_handle()
         if not cd.name or len(cd.name) < 2:
             raise ValueError("Invalid name in array class description")
@@ -714,7 +959,19 @@ class JavaStreamParser(api.IJavaStreamParser):
             if content is not None:
                 break
         else:
-            content = [self._read_field_value(field_type) for _ in range(size)]
+            # Don't trust the size to allocate the content: a truncated
+            # stream must fail on its end, not on a huge allocation
+            reader = self.__field_readers.get(field_type)
+            if reader is not None:
+                content = [reader() for _ in range(size)]
+            else:
+                content = []  # type: List[Any]
+                append = content.append
+                read_value = self._read_field_value
+                for _ in range(size):
+                    append(read_value(field_type))
+                    if self.__pending_exception is not None:
+                        return None
 
         return JavaArray(handle, cd, field_type, content)
 
@@ -738,7 +995,8 @@ class JavaStreamParser(api.IJavaStreamParser):
             raise ValueError("Exception object is not an instance")
 
         if content.is_exception:
-            raise ExceptionRead(content)
+            # Nested exception: return it as is
+            return content
 
         # Strange object ?
         content.is_exception = True
@@ -43,6 +43,18 @@ __docformat__ = "restructuredtext en"
 
 # ------------------------------------------------------------------------------
 
+# Pre-compiled structs of the primitive types
+_S_B = struct.Struct(">B")
+_S_b = struct.Struct(">b")
+_S_H = struct.Struct(">H")
+_S_h = struct.Struct(">h")
+_S_i = struct.Struct(">i")
+_S_f = struct.Struct(">f")
+_S_q = struct.Struct(">q")
+_S_d = struct.Struct(">d")
+
+# ------------------------------------------------------------------------------
+
 
 class DataStreamReader:
     """
@@ -81,81 +93,97 @@ class DataStreamReader:
 
         return struct.unpack(struct_format, bytes_array)
 
+    def read_struct(self, compiled_struct):
+        # type: (struct.Struct) -> Tuple[Any, ...]
+        """
+        Reads from the input stream, using a pre-compiled struct
+
+        :param compiled_struct: A struct.Struct object
+        :return: The result of its unpack method (tuple)
+        :raise EOFError: End of stream reached during unpacking
+        """
+        bytes_array = self.__fd.read(compiled_struct.size)
+
+        if len(bytes_array) != compiled_struct.size:
+            raise EOFError("Stream has ended unexpectedly while parsing.")
+
+        return compiled_struct.unpack(bytes_array)
+
     def read_bool(self):
         # type: () -> bool
         """
         Shortcut to read a single `boolean` (1 byte)
         """
-        return bool(self.read(">B")[0])
+        return bool(self.read_struct(_S_B)[0])
 
     def read_byte(self):
         # type: () -> int
         """
         Shortcut to read a single `byte` (1 byte)
         """
-        return self.read(">b")[0]
+        return self.read_struct(_S_b)[0]
 
     def read_ubyte(self):
         # type: () -> int
         """
         Shortcut to read an unsigned `byte` (1 byte)
         """
-        return self.read(">B")[0]
+        return self.read_struct(_S_B)[0]
 
     def read_char(self):
         # type: () -> UNICODE_TYPE
         """
         Shortcut to read a single `char` (2 bytes)
         """
-        return unicode_char(self.read(">H")[0])
+        return unicode_char(self.read_struct(_S_H)[0])
 
     def read_short(self):
         # type: () -> int
         """
         Shortcut to read a single `short` (2 bytes)
         """
-        return self.read(">h")[0]
+        return self.read_struct(_S_h)[0]
 
     def read_ushort(self):
         # type: () -> int
         """
         Shortcut to read an unsigned `short` (2 bytes)
         """
-        return self.read(">H")[0]
+        return self.read_struct(_S_H)[0]
 
     def read_int(self):
         # type: () -> int
         """
         Shortcut to read a single `int` (4 bytes)
         """
-        return self.read(">i")[0]
+        return self.read_struct(_S_i)[0]
 
     def read_float(self):
         # type: () -> float
         """
         Shortcut to read a single `float` (4 bytes)
         """
-        return self.read(">f")[0]
+        return self.read_struct(_S_f)[0]
 
     def read_long(self):
         # type: () -> int
         """
         Shortcut to read a single `long` (8 bytes)
         """
-        return self.read(">q")[0]
+        return self.read_struct(_S_q)[0]
 
     def read_double(self):
         # type: () -> float
         """
         Shortcut to read a single `double` (8 bytes)
         """
-        return self.read(">d")[0]
+        return self.read_struct(_S_d)[0]
 
     def read_UTF(self):  # pylint:disable=C0103
         # type: () -> str
         """
         Reads a Java string
         """
-        length = self.read_ushort()
+        length = self.read_struct(_S_H)[0]
         ba = self.__fd.read(length)
         return decode_modified_utf8(ba)[0]
@@ -112,8 +112,8 @@ class JavaPrimitiveClass(JavaInstance):
         """
         Load content from a parsed instance object
         """
-        for fields in self.field_data.values():
-            for field, value in fields.items():
+        for _, fields in self._iter_field_items():
+            for field, value in fields:
                 if field.name == "value":
                     self.value = value
                     return True
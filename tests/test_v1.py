@@ -32,17 +32,22 @@ http://download.oracle.com/javase/6/docs/platform/serialization/spec/protocol.ht
 from __future__ import print_function
 
 # Standard library
+import gzip
 import logging
 import os
+import struct
 import subprocess
 import sys
+import tempfile
 import unittest
+from io import BytesIO
 
 # Prepare Python path to import javaobj
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.getcwd())))
 
 # Local
 import javaobj.v1 as javaobj
+from javaobj.constants import ClassDescFlags
 from javaobj.utils import hexdump, java_data_fd
 
 # ------------------------------------------------------------------------------
@@ -105,6 +110,12 @@ class TestJavaobjV1(unittest.TestCase):
         """
         _logger.debug("Try Marshalling")
         marshalled_stream = javaobj.dumps(original_object)
+
+        # Writing to a stream must give the same content
+        output = BytesIO()
+        javaobj.dump(original_object, output)
+        self.assertEqual(marshalled_stream, output.getvalue())
+
         # Reloading the new dump allows to compare the decoding sequence
         try:
             javaobj.loads(marshalled_stream)
@@ -169,6 +180,26 @@ class TestJavaobjV1(unittest.TestCase):
         _logger.debug("Read char objects: %s", pobj)
         self.assertEqual(pobj, expected)
 
+    def test_gzip_load(self):
+        """
+        Reads testChars.ser.gz as a stream, without seeking to its end
+        """
+
+        class NoEndSeekGzipFile(gzip.GzipFile):
+            """
+            GZip file which can't seek from its end, like in Python 2
+            """
+
+            def seek(self, offset, whence=os.SEEK_SET):
+                if whence == os.SEEK_END:
+                    raise ValueError("Seek from end not supported")
+                return gzip.GzipFile.seek(self, offset, whence)
+
+        expected = "python-javaobj".encode("utf-16-be").decode("latin1")
+        with self.read_file("testChars.ser.gz", stream=True) as filep:
+            with NoEndSeekGzipFile(fileobj=filep, mode="rb") as fd:
+                self.assertEqual(javaobj.load(fd), expected)
+
     def test_double_rw(self):
         """
         Reads testDouble.ser and checks the serialization process
@@ -206,6 +237,47 @@ class TestJavaobjV1(unittest.TestCase):
         self.assertEqual(pobj.myArray._data, (1, 3, 7, 11))
         self._try_marshalling(jobj, pobj)
 
+    def test_byte_array_position(self):
+        """
+        Tests the reading of a byte array followed by another object
+        """
+        # Object[] {byte[] {1, 2, -1}, "hello"}
+        jobj = (
+            b"\xac\xed\x00\x05"
+            + b"\x75\x72\x00\x13[Ljava.lang.Object;"
+            + b"\x90\xce\x58\x9f\x10\x73\x29\x6c\x02\x00\x00\x78\x70"
+            + b"\x00\x00\x00\x02"
+            + b"\x75\x72\x00\x02[B"
+            + b"\xac\xf3\x17\xf8\x06\x08\x54\xe0\x02\x00\x00\x78\x70"
+            + b"\x00\x00\x00\x03\x01\x02\xff"
+            + b"\x74\x00\x05hello"
+        )
+        pobj = javaobj.loads(jobj)
+        self.assertEqual(len(pobj), 2)
+        self.assertIsInstance(pobj[0], javaobj.beans.JavaByteArray)
+        self.assertEqual(list(pobj[0]), [1, 2, -1])
+        self.assertEqual(pobj[1], u"hello")
+
+    def test_renamed_field_dump(self):
+        """
+        Tests the marshalling of an object after renaming one of its fields
+        """
+        jobj = self.read_file("testClassWithByteArray.ser")
+        pobj = javaobj.loads(jobj)
+        self.assertIn(b"myArray", javaobj.dumps(pobj))
+
+        classdesc = pobj.get_class()
+        idx = classdesc.fields_names.index("myArray")
+        classdesc.fields_names[idx] = "zzArray"
+        pobj.zzArray = pobj.myArray
+
+        marshalled = javaobj.dumps(pobj)
+        self.assertIn(b"zzArray", marshalled)
+        self.assertNotIn(b"myArray", marshalled)
+        self.assertEqual(
+            javaobj.loads(marshalled).zzArray._data, (1, 3, 7, 11)
+        )
+
     def test_boolean(self):
         """
         Reads testBoolean.ser and checks the serialization process
@@ -297,6 +369,37 @@ class TestJavaobjV1(unittest.TestCase):
 
         self._try_marshalling(jobj, pobj)
 
+    def test_raw_stream(self):
+        """
+        Tests the reading of objects from unbuffered files
+        """
+        jobj = self.read_file("objSuper.ser")
+        fd, path = tempfile.mkstemp(suffix=".ser")
+        os.close(fd)
+        try:
+            # Valid object followed by some data
+            with open(path, "wb") as filep:
+                filep.write(jobj + b"trailing")
+
+            with open(path, "rb", buffering=0) as filep:
+                pobj = javaobj.load(filep, ignore_remaining_data=True)
+                self.assertEqual(pobj.childString, u"Child!!")
+
+                # The file is left right after the object
+                self.assertFalse(filep.closed)
+                self.assertEqual(filep.tell(), len(jobj))
+                self.assertEqual(filep.read(), b"trailing")
+
+            # Truncated object
+            with open(path, "wb") as filep:
+                filep.write(jobj[:-20])
+
+            with open(path, "rb", buffering=0) as filep:
+                self.assertRaises(RuntimeError, javaobj.load, filep)
+                self.assertFalse(filep.closed)
+        finally:
+            os.remove(path)
+
     def test_arrays(self):
         """
         Tests handling of Java arrays
@@ -370,6 +473,31 @@ class TestJavaobjV1(unittest.TestCase):
             pobj, [[1, 2, 3], [4, 5, 6],],
         )
 
+    def test_primitive_arrays_dump(self):
+        """
+        Tests the marshalling of primitive arrays and their values range
+        """
+        for type_char, values, error in (
+            ("F", [1.5, -2.0], None),
+            ("Z", [True, False], None),
+            ("C", [u"a", u"\uffff"], None),
+            ("F", [1.5, 1e300], OverflowError),
+            ("I", [1, 2 ** 40], struct.error),
+            ("B", [1, 200], struct.error),
+        ):
+            classdesc = javaobj.beans.JavaClass()
+            classdesc.name = "[" + type_char
+            classdesc.serialVersionUID = 0
+            classdesc.flags = ClassDescFlags.SC_SERIALIZABLE
+
+            array = javaobj.beans.JavaArray(classdesc)
+            array.extend(values)
+
+            if error is None:
+                self.assertEqual(javaobj.loads(javaobj.dumps(array)), values)
+            else:
+                self.assertRaises(error, javaobj.dumps, array)
+
     def test_enums(self):
         """
         Tests the handling of "enum" types
@@ -473,6 +601,31 @@ class TestJavaobjV1(unittest.TestCase):
         # FIXME: referencing problems with the collection class
         # self._try_marshalling(jobj, pobj)
 
+    def test_linked_hash_map(self):
+        """
+        Tests the loading of a LinkedHashMap and its declared size
+        """
+
+        def linked_hash_map(size, content):
+            return (
+                b"\xac\xed\x00\x05"
+                + b"\x73\x72\x00\x17java.util.LinkedHashMap"
+                + b"\x34\xc0\x4e\x5c\x10\x6c\xc0\xfb\x02"
+                + b"\x00\x01\x5a\x00\x0baccessOrder\x78\x70"
+                + b"\x77\x08"
+                + struct.pack(">ii", 16, size)
+                + content
+            )
+
+        entries = b"\x74\x00\x01a\x74\x00\x01b\x74\x00\x01c\x74\x00\x01d"
+        pobj = javaobj.loads(linked_hash_map(2, entries + b"\x78\x00"))
+        self.assertEqual(pobj, {u"a": u"b", u"c": u"d"})
+
+        # Truncated stream declaring a huge map
+        self.assertRaises(
+            RuntimeError, javaobj.loads, linked_hash_map(2 ** 31 - 1, entries)
+        )
+
     def test_jceks_issue_5(self):
         """
         Tests the handling of JCEKS issue #5
@@ -34,6 +34,7 @@ from __future__ import print_function
 # Standard library
 import logging
 import os
+import pickle
 import struct
 import subprocess
 import sys
@@ -46,6 +47,7 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(os.getcwd())))
 import javaobj.v2 as javaobj
 
 # Local
+from javaobj.modifiedutf8 import decode_modified_utf8, decoder
 from javaobj.utils import bytes_char, java_data_fd
 
 # ------------------------------------------------------------------------------
@@ -395,6 +397,98 @@ class TestJavaobjV2(unittest.TestCase):
         self.assertEqual(pobj.integer, -1)
         self.assertEqual(pobj.superString, u"Super!!")
 
+    def test_fields_modified(self):
+        """
+        Checks that fields attributes follow the changes of the field data
+        """
+        jobj = self.read_file("objSuper.ser")
+        pobj = javaobj.loads(jobj)
+        self.assertEqual(pobj.childString, u"Child!!")
+        self.assertEqual(pobj.superString, u"Super!!")
+
+        field_data = pobj.field_data
+        self.assertEqual(pobj.superString, u"Super!!")
+
+        # Modify the field data in place
+        for cd_fields in field_data.values():
+            for field in cd_fields:
+                if field.name == "superString":
+                    cd_fields[field] = u"Changed!!"
+
+        self.assertEqual(pobj.superString, u"Changed!!")
+        self.assertEqual(pobj.childString, u"Child!!")
+        self.assertRaises(AttributeError, getattr, pobj, "unknown")
+
+    def test_field_data(self):
+        """
+        Checks the field data of an instance, per class of its hierarchy
+        """
+        jobj = self.read_file("objSuper.ser")
+        pobj = javaobj.loads(jobj)
+        dump = pobj.dump()
+        self.assertIn("SuperAaaa -- 3 fields", dump)
+        self.assertIn("\tINTEGER integer: -1", dump)
+
+        field_data = pobj.field_data
+        self.assertIs(pobj.field_data, field_data)
+        self.assertEqual(
+            {
+                cd.name: {field.name: value for field, value in fields.items()}
+                for cd, fields in field_data.items()
+            },
+            {
+                "SuperAaaa": {
+                    "bool": True,
+                    "integer": -1,
+                    "superString": u"Super!!",
+                },
+                "TestConcrete": {"childString": u"Child!!"},
+            },
+        )
+        for cd, fields in field_data.items():
+            self.assertEqual(set(fields), set(cd.fields))
+
+        # Same dump once the field data has been built
+        self.assertEqual(pobj.dump(), dump)
+
+        # Replace the field data
+        classdesc = pobj.get_class()
+        pobj.field_data = {classdesc: {classdesc.fields[0]: u"Replaced"}}
+        self.assertEqual(pobj.childString, u"Replaced")
+        self.assertRaises(AttributeError, getattr, pobj, "superString")
+
+        dump = pobj.dump()
+        self.assertIn("TestConcrete -- 1 fields", dump)
+        self.assertIn("Replaced", dump)
+        self.assertNotIn("SuperAaaa", dump)
+
+    def test_primitive_class_fields(self):
+        """
+        Checks the loading of boxed primitive values from their fields
+        """
+        jobj = self.read_file("testBoolIntLong.ser")
+        pobj = javaobj.loads(jobj)
+        boxed = pobj[u"int"]
+        self.assertIsInstance(boxed, javaobj.transformers.JavaPrimitiveClass)
+        self.assertEqual(boxed.value, 9)
+
+        # The value has been loaded without building the field data
+        self.assertIsNone(boxed._field_data)  # pylint:disable=W0212
+        self.assertEqual(
+            [
+                (field.name, value)
+                for fields in boxed.field_data.values()
+                for field, value in fields.items()
+            ],
+            [("value", 9)],
+        )
+
+        # Load the value from a new field data
+        classdesc = boxed.get_class()
+        boxed.field_data = {classdesc: {classdesc.fields[0]: 10}}
+        self.assertTrue(boxed.load_from_instance())
+        self.assertEqual(boxed.value, 10)
+
     def test_arrays(self):
         """
         Tests handling of Java arrays
@@ -433,6 +527,98 @@ class TestJavaobjV2(unittest.TestCase):
             pobj, b"\xe6\x97\xa5\xe6\x9c\xac\xe5\x9b\xbd".decode("utf-8")
         )
 
+    def test_supplementary_chars(self):
+        """
+        Tests the decoding of characters encoded as surrogate pairs
+        """
+        # U+1F600, as written by Java: a pair of 3-byte surrogates
+        encoded = b"a\xed\xa0\xbd\xed\xb8\x80b"
+        jobj = (
+            b"\xac\xed\x00\x05\x74"
+            + struct.pack(">H", len(encoded))
+            + encoded
+        )
+        pobj = javaobj.loads(jobj)
+        self.assertEqual(pobj, b"a\xf0\x9f\x98\x80b".decode("utf-8"))
+
+    def test_hangul_chars(self):
+        """
+        Tests the decoding of 3-byte characters starting with 0xED, which are
+        not surrogates
+        """
+        # U+D55C U+AD6D, then the same after a surrogate pair
+        hangul = b"\xed\x95\x9c\xea\xb5\xad"
+        for encoded, expected in (
+            (hangul, hangul),
+            (
+                b"\xed\xa0\xbd\xed\xb8\x80" + hangul,
+                b"\xf0\x9f\x98\x80" + hangul,
+            ),
+        ):
+            jobj = (
+                b"\xac\xed\x00\x05\x74"
+                + struct.pack(">H", len(encoded))
+                + encoded
+            )
+            pobj = javaobj.loads(jobj)
+            self.assertEqual(pobj, expected.decode("utf-8"))
+
+            # Same result with the complete decoder
+            self.assertEqual(
+                u"".join(decoder(encoded)), expected.decode("utf-8")
+            )
+
+    def test_decode_errors(self):
+        """
+        Tests the handling of invalid Modified UTF-8 sequences
+        """
+        for data, position in (
+            # Truncated 3-byte sequence
+            (b"ab\xe6\x97", 2),
+            # Misplaced continuation byte
+            (b"ab\x80cd", 2),
+            # Raw zero byte
+            (b"ab\x00cd", 2),
+        ):
+            try:
+                decode_modified_utf8(data)
+            except UnicodeDecodeError as ex:
+                self.assertEqual(ex.start, position)
+            else:
+                self.fail("No error decoding {0!r}".format(data))
+
+            self.assertRaises(
+                UnicodeDecodeError, decode_modified_utf8, data, "strict"
+            )
+
+            # Decoding stops at the invalid sequence
+            self.assertEqual(
+                decode_modified_utf8(data, "replace"), (u"ab\ufffd", 3)
+            )
+            self.assertEqual(decode_modified_utf8(data, "ignore"), (u"ab", 2))
+
+    def test_truncated_array(self):
+        """
+        Tests the reading of an array larger than its stream
+        """
+        # Object[] of 2^31 - 1 items, without content
+        jobj = (
+            b"\xac\xed\x00\x05"
+            + b"\x75\x72\x00\x13[Ljava.lang.Object;"
+            + b"\x90\xce\x58\x9f\x10\x73\x29\x6c\x02\x00\x00\x78\x70"
+            + struct.pack(">i", 2 ** 31 - 1)
+        )
+        self.assertRaises(EOFError, javaobj.loads, jobj)
+
+    def test_pickle(self):
+        """
+        Checks that parsed contents can be pickled
+        """
+        for filename in ("obj6.ser", "test2DArray.ser", "testClass.ser"):
+            pobj = javaobj.loads(self.read_file(filename))
+            pickled = pickle.loads(pickle.dumps(pobj, 2))
+            self.assertEqual(pickled.dump(), pobj.dump())
+
     def test_char_array(self):
         """
         Tests the loading of a wide-char array